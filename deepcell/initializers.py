@@ -29,7 +29,9 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import division
 
+import numpy as np
 from tensorflow.keras import backend as K
+from tensorflow.keras import initializers
 from tensorflow.keras.initializers import Initializer
 
 
@@ -55,3 +57,56 @@ class PriorProbability(Initializer):
         bias = -K.log((1 - self.probability) / self.probability)
         result = K.get_value(K.ones(shape, dtype=dtype)) * bias
         return result
+
+
+class Bilinear(Initializer):
+    """Initializer for transposed convolution kernels that performs
+    bilinear upsampling of each channel.
+
+    The spatial kernel is the outer product of 1D bilinear (tent)
+    filters, placed on the diagonal of the output and input channels.
+    Spatial dimensions of size 1 are left unchanged.
+
+    Adapted from the ``bilinear_kernel`` of the FCN reference implementation.
+    That kernel maps each channel to itself, so when the numbers of input
+    and output channels differ, the diagonal is added to the weights of
+    ``initializer`` instead of zeros, so that every channel is used.
+
+    Args:
+        initializer (str): Optional initializer for the kernel when the
+            numbers of input and output channels differ.
+    """
+
+    def __init__(self, initializer=None):
+        if initializer is not None:
+            initializer = initializers.get(initializer)
+        self.initializer = initializer
+
+    def get_config(self):
+        initializer = self.initializer
+        if initializer is not None:
+            initializer = initializers.serialize(initializer)
+        return {
+            'initializer': initializer
+        }
+
+    def __call__(self, shape, dtype=None, partition_info=None):
+        # transposed convolution kernels are (*spatial, filters, channels)
+        spatial_shape = shape[:-2]
+        kernel = np.ones(spatial_shape)
+        for axis, size in enumerate(spatial_shape):
+            factor = (size + 1) // 2
+            center = factor - 1 if size % 2 == 1 else factor - 0.5
+            tent = 1 - np.abs(np.arange(size) - center) / factor
+            broadcast_shape = [1] * len(spatial_shape)
+            broadcast_shape[axis] = size
+            kernel = kernel * np.reshape(tent, broadcast_shape)
+
+        weights = np.zeros(shape)
+        for i in range(min(shape[-2], shape[-1])):
+            weights[..., i, i] = kernel
+        weights = K.constant(weights, dtype=dtype)
+
+        if self.initializer is not None and shape[-2] != shape[-1]:
+            weights = weights + self.initializer(shape, dtype=weights.dtype)
+        return weights
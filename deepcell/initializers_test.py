@@ -29,10 +29,11 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import numpy as np
 from tensorflow.keras import backend as K
 from tensorflow.python.keras import keras_parameterized
 
-from deepcell.initializers import PriorProbability
+from deepcell.initializers import PriorProbability, Bilinear
 
 
 @keras_parameterized.run_with_all_model_types
@@ -56,3 +57,30 @@ class InitializersTest(keras_parameterized.TestCase):
         with self.cached_session():
             self._runner(PriorProbability(probability=0.01),
                          tensor_shape, target_mean=0., target_std=1)
+
+    def test_bilinear(self):
+        tensor_shape = (4, 4, 3, 2)
+        with self.cached_session():
+            self._runner(Bilinear(), tensor_shape)
+
+            kernel = K.get_value(Bilinear()(tensor_shape))
+            tent = np.array([0.25, 0.75, 0.75, 0.25])
+            self.assertAllClose(kernel[..., 0, 0], np.outer(tent, tent))
+            self.assertAllClose(kernel[..., 1, 1], np.outer(tent, tent))
+            self.assertAllClose(kernel[..., 2, :], np.zeros((4, 4, 2)))
+            self.assertAllClose(kernel[..., 0, 1], np.zeros((4, 4)))
+
+            # spatial dimensions of size 1 are not interpolated
+            kernel = K.get_value(Bilinear()((1, 4, 4, 2, 2)))
+            self.assertAllClose(kernel[0, ..., 0, 0], np.outer(tent, tent))
+
+            # the diagonal is added to the initializer if the widths differ
+            self._runner(Bilinear('ones'), tensor_shape)
+            kernel = K.get_value(Bilinear('ones')(tensor_shape))
+            self.assertAllClose(kernel[..., 0, 0], np.outer(tent, tent) + 1)
+            self.assertAllClose(kernel[..., 0, 1], np.ones((4, 4)))
+            self.assertAllClose(kernel[..., 2, :], np.ones((4, 4, 2)))
+
+            # and ignored if they are the same
+            kernel = K.get_value(Bilinear('ones')((4, 4, 2, 2)))
+            self.assertAllClose(kernel[..., 0, 1], np.zeros((4, 4)))
@@ -35,7 +35,9 @@ from deepcell.layers import pooling
 from deepcell.layers import tensor_product
 from deepcell.layers import padding
 from deepcell.layers import filter_detections
+from deepcell.layers import fusion
 from deepcell.layers import retinanet
+from deepcell.layers import split
 from deepcell.layers import upsample
 
 from deepcell.layers.location import Location2D
@@ -48,6 +50,7 @@ from deepcell.layers.tensor_product import TensorProduct
 from deepcell.layers.padding import ReflectionPadding2D
 from deepcell.layers.padding import ReflectionPadding3D
 from deepcell.layers.filter_detections import FilterDetections
+from deepcell.layers.fusion import WeightedFusion
 from deepcell.layers.retinanet import Anchors
 from deepcell.layers.retinanet import RegressBoxes
 from deepcell.layers.retinanet import ClipBoxes
@@ -56,8 +59,11 @@ from deepcell.layers.retinanet import _RoiAlign
 from deepcell.layers.retinanet import RoiAlign
 from deepcell.layers.retinanet import Shape
 from deepcell.layers.retinanet import Cast
+from deepcell.layers.split import Split
 from deepcell.layers.upsample import Upsample
 from deepcell.layers.upsample import UpsampleLike
+from deepcell.layers.upsample import DepthToSpace2D
+from deepcell.layers.upsample import DepthToSpace3D
 from deepcell.layers.convolutional_recurrent import ConvGRU2D
 
 del absolute_import
@@ -0,0 +1,77 @@
+# Copyright 2016-2020 The Van Valen Lab at the California Institute of
+# Technology (Caltech), with support from the Paul Allen Family Foundation,
+# Google, & National Institutes of Health (NIH) under Grant U24CA224309-01.
+# All rights reserved.
+#
+# Licensed under a modified Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.github.com/vanvalenlab/deepcell-tf/LICENSE
+#
+# The Work provided may be used for non-commercial academic purposes only.
+# For any other use of the Work, including commercial use, please contact:
+# vanvalenlab@gmail.com
+#
+# Neither the name of Caltech nor the names of its contributors may be used
+# to endorse or promote products derived from this software without specific
+# prior written permission.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Layers to fuse features from several inputs"""
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import tensorflow as tf
+from tensorflow.python.framework import tensor_shape
+from tensorflow.keras.layers import Layer
+
+
+class WeightedFusion(Layer):
+    """Fast normalized fusion of several inputs of the same shape,
+    from EfficientDet (https://arxiv.org/abs/1911.09070).
+
+    ``output = sum(w_i * x_i) / (sum(w_i) + epsilon)``, where the ``w_i``
+    are trainable weights clipped to be non-negative.
+
+    Args:
+        epsilon (float): Small value added to the sum of the weights to
+            avoid numerical instability.
+    """
+    def __init__(self, epsilon=1e-4, **kwargs):
+        super(WeightedFusion, self).__init__(**kwargs)
+        self.epsilon = epsilon
+
+    def build(self, input_shape):
+        shape_types = (list, tuple, tensor_shape.TensorShape)
+        if (not isinstance(input_shape, (list, tuple))
+                or len(input_shape) < 2
+                or not all(isinstance(s, shape_types) for s in input_shape)):
+            raise ValueError('A WeightedFusion layer should be called '
+                             'on a list of at least 2 inputs.')
+        self.kernel = self.add_weight(
+            name='kernel',
+            shape=(len(input_shape),),
+            initializer='ones',
+            trainable=True)
+        self.built = True
+
+    def call(self, inputs):
+        weights = tf.nn.relu(self.kernel)
+        weights = weights / (tf.reduce_sum(weights) + self.epsilon)
+        return tf.add_n([weights[i] * x for i, x in enumerate(inputs)])
+
+    def compute_output_shape(self, input_shape):
+        return tensor_shape.TensorShape(input_shape[0])
+
+    def get_config(self):
+        config = {'epsilon': self.epsilon}
+        base_config = super(WeightedFusion, self).get_config()
+        return dict(list(base_config.items()) + list(config.items()))
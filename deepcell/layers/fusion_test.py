@@ -0,0 +1,78 @@
+# Copyright 2016-2020 The Van Valen Lab at the California Institute of
+# Technology (Caltech), with support from the Paul Allen Family Foundation,
+# Google, & National Institutes of Health (NIH) under Grant U24CA224309-01.
+# All rights reserved.
+#
+# Licensed under a modified Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.github.com/vanvalenlab/deepcell-tf/LICENSE
+#
+# The Work provided may be used for non-commercial academic purposes only.
+# For any other use of the Work, including commercial use, please contact:
+# vanvalenlab@gmail.com
+#
+# Neither the name of Caltech nor the names of its contributors may be used
+# to endorse or promote products derived from this software without specific
+# prior written permission.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for the fusion layers"""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import numpy as np
+from tensorflow.keras import backend as K
+from tensorflow.keras.layers import Input
+from tensorflow.keras.models import Model
+from tensorflow.python.keras import keras_parameterized
+from tensorflow.python.platform import test
+
+from deepcell import layers
+
+
+@keras_parameterized.run_all_keras_modes
+class TestWeightedFusion(keras_parameterized.TestCase):
+
+    def test_weighted_fusion(self):
+        x = np.random.random((2, 4, 4, 3)).astype(K.floatx())
+        y = np.random.random((2, 4, 4, 3)).astype(K.floatx())
+        layer = layers.WeightedFusion(epsilon=0)
+
+        # initialized to the mean of the inputs
+        outputs = layer([K.variable(x), K.variable(y)])
+        self.assertAllClose(K.get_value(outputs), (x + y) / 2)
+
+        # negative weights are clipped
+        layer.set_weights([np.array([3, -1], dtype=K.floatx())])
+        outputs = layer([K.variable(x), K.variable(y)])
+        self.assertAllClose(K.get_value(outputs), x)
+
+    def test_serialization(self):
+        a = Input(shape=(4, 4, 3))
+        b = Input(shape=(4, 4, 3))
+        c = Input(shape=(4, 4, 3))
+        outputs = layers.WeightedFusion(name='fusion')([a, b, c])
+        model = Model([a, b, c], outputs)
+        self.assertEqual(model.output_shape, (None, 4, 4, 3))
+        self.assertEqual(model.get_layer('fusion').get_weights()[0].shape,
+                         (3,))
+
+        model = Model.from_config(model.get_config(), custom_objects={
+            'WeightedFusion': layers.WeightedFusion})
+        self.assertEqual(model.output_shape, (None, 4, 4, 3))
+
+    def test_bad_inputs(self):
+        with self.assertRaises(ValueError):
+            layers.WeightedFusion().build((None, 4, 4, 3))
+
+
+if __name__ == '__main__':
+    test.main()
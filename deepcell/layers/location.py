@@ -29,6 +29,7 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import division
 
+import numpy as np
 import tensorflow as tf
 from tensorflow.python.framework import tensor_shape
 from tensorflow.keras import backend as K
@@ -36,6 +37,27 @@ from tensorflow.keras.layers import Layer
 from tensorflow.python.keras.utils import conv_utils
 
 
+def _get_location_grid(spatial_shape, dtype=None):
+    """Get the coordinates of each position in a grid, scaled to ``[0, 1]``.
+
+    The grid only depends on the static ``spatial_shape``, so it is computed
+    with numpy and embedded in the graph as a constant.
+
+    Args:
+        spatial_shape (tuple): The size of each spatial dimension.
+        dtype (str): The dtype of the coordinates, defaults to ``floatx``.
+
+    Returns:
+        numpy.array: Coordinates of shape ``(*spatial_shape, ndim)``.
+    """
+    dtype = K.floatx() if dtype is None else dtype
+    coords = []
+    for size in spatial_shape:
+        coord = np.arange(size, dtype=dtype)
+        coords.append(coord / coord.max())
+    return np.stack(np.meshgrid(*coords, indexing='ij'), axis=-1)
+
+
 class Location2D(Layer):
     """Location Layer for 2D cartesian coordinate locations.
 
@@ -62,34 +84,17 @@ class Location2D(Layer):
         return tensor_shape.TensorShape(output_shape)
 
     def call(self, inputs):
-        input_shape = self.in_shape
         if self.data_format == 'channels_first':
-            x = K.arange(0, input_shape[1], dtype=K.floatx())
-            y = K.arange(0, input_shape[2], dtype=K.floatx())
+            spatial_shape = self.in_shape[1:3]
         else:
-            x = K.arange(0, input_shape[0], dtype=K.floatx())
-            y = K.arange(0, input_shape[1], dtype=K.floatx())
+            spatial_shape = self.in_shape[0:2]
 
-        x = x / K.max(x)
-        y = y / K.max(y)
-
-        loc_x, loc_y = tf.meshgrid(x, y, indexing='ij')
-
-        if self.data_format == 'channels_first':
-            loc = K.stack([loc_x, loc_y], axis=0)
-        else:
-            loc = K.stack([loc_x, loc_y], axis=-1)
-
-        location = K.expand_dims(loc, axis=0)
+        location = _get_location_grid(spatial_shape)
         if self.data_format == 'channels_first':
-            location = K.permute_dimensions(location, pattern=[0, 2, 3, 1])
+            location = np.moveaxis(location, -1, 0)
 
-        location = tf.tile(location, [K.shape(inputs)[0], 1, 1, 1])
-
-        if self.data_format == 'channels_first':
-            location = K.permute_dimensions(location, pattern=[0, 3, 1, 2])
-
-        return location
+        location = K.constant(location[np.newaxis])
+        return tf.tile(location, [K.shape(inputs)[0], 1, 1, 1])
 
     def get_config(self):
         config = {
@@ -128,39 +133,17 @@ class Location3D(Layer):
         return tensor_shape.TensorShape(output_shape)
 
     def call(self, inputs):
-        input_shape = self.in_shape
-
-        if self.data_format == 'channels_first':
-            z = K.arange(0, input_shape[1], dtype=K.floatx())
-            x = K.arange(0, input_shape[2], dtype=K.floatx())
-            y = K.arange(0, input_shape[3], dtype=K.floatx())
-        else:
-            z = K.arange(0, input_shape[0], dtype=K.floatx())
-            x = K.arange(0, input_shape[1], dtype=K.floatx())
-            y = K.arange(0, input_shape[2], dtype=K.floatx())
-
-        x = x / K.max(x)
-        y = y / K.max(y)
-        z = z / K.max(z)
-
-        loc_z, loc_x, loc_y = tf.meshgrid(z, x, y, indexing='ij')
-
         if self.data_format == 'channels_first':
-            loc = K.stack([loc_z, loc_x, loc_y], axis=0)
+            spatial_shape = self.in_shape[1:4]
         else:
-            loc = K.stack([loc_z, loc_x, loc_y], axis=-1)
-
-        location = K.expand_dims(loc, axis=0)
-
-        if self.data_format == 'channels_first':
-            location = K.permute_dimensions(location, pattern=[0, 2, 3, 4, 1])
-
-        location = tf.tile(location, [K.shape(inputs)[0], 1, 1, 1, 1])
+            spatial_shape = self.in_shape[0:3]
 
+        location = _get_location_grid(spatial_shape)
         if self.data_format == 'channels_first':
-            location = K.permute_dimensions(location, pattern=[0, 4, 1, 2, 3])
+            location = np.moveaxis(location, -1, 0)
 
-        return location
+        location = K.constant(location[np.newaxis])
+        return tf.tile(location, [K.shape(inputs)[0], 1, 1, 1, 1])
 
     def get_config(self):
         config = {
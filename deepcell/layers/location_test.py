@@ -28,6 +28,8 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import division
 
+import numpy as np
+from tensorflow.keras import backend as K
 from tensorflow.python.keras import testing_utils
 from tensorflow.python.keras import keras_parameterized
 from tensorflow.keras.utils import custom_object_scope
@@ -65,6 +67,37 @@ class LocationTest(keras_parameterized.TestCase):
                         'data_format': 'channels_first'},
                 input_shape=(3, 4, 11, 12, 10))
 
+    def test_location_2d_values(self):
+        x = np.linspace(0, 1, 5)
+        y = np.linspace(0, 1, 3)
+        inputs = K.variable(np.zeros((2, 5, 3, 1)))
+        layer = layers.Location2D(in_shape=(5, 3, 1),
+                                  data_format='channels_last')
+        location = K.get_value(layer(inputs))
+        self.assertEqual(location.shape, (2, 5, 3, 2))
+        for b in range(2):
+            self.assertAllClose(location[b, ..., 0],
+                                np.broadcast_to(x[:, None], (5, 3)))
+            self.assertAllClose(location[b, ..., 1],
+                                np.broadcast_to(y[None, :], (5, 3)))
+
+        inputs = K.variable(np.zeros((2, 1, 5, 3)))
+        layer = layers.Location2D(in_shape=(1, 5, 3),
+                                  data_format='channels_first')
+        channels_first = K.get_value(layer(inputs))
+        self.assertAllClose(channels_first,
+                            np.moveaxis(location, -1, 1))
+
+    def test_location_3d_values(self):
+        inputs = K.variable(np.zeros((2, 4, 5, 3, 1)))
+        layer = layers.Location3D(in_shape=(4, 5, 3, 1),
+                                  data_format='channels_last')
+        location = K.get_value(layer(inputs))
+        self.assertEqual(location.shape, (2, 4, 5, 3, 3))
+        self.assertAllClose(location[0, :, 0, 0, 0], np.linspace(0, 1, 4))
+        self.assertAllClose(location[1, 0, :, 0, 1], np.linspace(0, 1, 5))
+        self.assertAllClose(location[1, 0, 0, :, 2], np.linspace(0, 1, 3))
+
 
 if __name__ == '__main__':
     test.main()
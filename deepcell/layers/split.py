@@ -0,0 +1,80 @@
+# Copyright 2016-2020 The Van Valen Lab at the California Institute of
+# Technology (Caltech), with support from the Paul Allen Family Foundation,
+# Google, & National Institutes of Health (NIH) under Grant U24CA224309-01.
+# All rights reserved.
+#
+# Licensed under a modified Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.github.com/vanvalenlab/deepcell-tf/LICENSE
+#
+# The Work provided may be used for non-commercial academic purposes only.
+# For any other use of the Work, including commercial use, please contact:
+# vanvalenlab@gmail.com
+#
+# Neither the name of Caltech nor the names of its contributors may be used
+# to endorse or promote products derived from this software without specific
+# prior written permission.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Layer to split a tensor into several tensors"""
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import tensorflow as tf
+from tensorflow.python.framework import tensor_shape
+from tensorflow.keras.layers import Layer
+
+
+class Split(Layer):
+    """Layer that splits a tensor into several tensors along an axis.
+
+    The inverse of ``tensorflow.keras.layers.Concatenate``.
+
+    Args:
+        num_or_size_splits (int or list): Either the number of equal
+            splits or a list of the sizes of each split.
+        axis (int): The axis to split along.
+    """
+    def __init__(self, num_or_size_splits, axis=-1, **kwargs):
+        super(Split, self).__init__(**kwargs)
+        self.num_or_size_splits = num_or_size_splits
+        self.axis = axis
+
+    def _get_sizes(self, dim):
+        if not isinstance(self.num_or_size_splits, int):
+            return list(self.num_or_size_splits)
+
+        n = self.num_or_size_splits
+        if dim is not None and dim % n != 0:
+            raise ValueError('Cannot split axis of size {} into {} equal '
+                             'parts.'.format(dim, n))
+        return [None if dim is None else dim // n] * n
+
+    def call(self, inputs):
+        return tf.split(inputs, self.num_or_size_splits, axis=self.axis)
+
+    def compute_output_shape(self, input_shape):
+        input_shape = tensor_shape.TensorShape(input_shape).as_list()
+        output_shapes = []
+        for size in self._get_sizes(input_shape[self.axis]):
+            output_shape = list(input_shape)
+            output_shape[self.axis] = size
+            output_shapes.append(tensor_shape.TensorShape(output_shape))
+        return output_shapes
+
+    def get_config(self):
+        config = {
+            'num_or_size_splits': self.num_or_size_splits,
+            'axis': self.axis
+        }
+        base_config = super(Split, self).get_config()
+        return dict(list(base_config.items()) + list(config.items()))
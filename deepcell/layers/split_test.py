@@ -0,0 +1,80 @@
+# Copyright 2016-2020 The Van Valen Lab at the California Institute of
+# Technology (Caltech), with support from the Paul Allen Family Foundation,
+# Google, & National Institutes of Health (NIH) under Grant U24CA224309-01.
+# All rights reserved.
+#
+# Licensed under a modified Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.github.com/vanvalenlab/deepcell-tf/LICENSE
+#
+# The Work provided may be used for non-commercial academic purposes only.
+# For any other use of the Work, including commercial use, please contact:
+# vanvalenlab@gmail.com
+#
+# Neither the name of Caltech nor the names of its contributors may be used
+# to endorse or promote products derived from this software without specific
+# prior written permission.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for the Split layer"""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import numpy as np
+from tensorflow.keras import backend as K
+from tensorflow.keras.layers import Concatenate, Input
+from tensorflow.keras.models import Model
+from tensorflow.python.keras import keras_parameterized
+from tensorflow.python.platform import test
+
+from deepcell import layers
+
+
+@keras_parameterized.run_all_keras_modes
+class TestSplit(keras_parameterized.TestCase):
+
+    def test_split_sizes(self):
+        inputs = np.random.random((2, 4, 4, 6)).astype(K.floatx())
+        layer = layers.Split([2, 4], axis=-1)
+        outputs = layer(K.variable(inputs))
+        self.assertEqual(len(outputs), 2)
+        self.assertAllClose(K.get_value(outputs[0]), inputs[..., :2])
+        self.assertAllClose(K.get_value(outputs[1]), inputs[..., 2:])
+
+        shapes = layer.compute_output_shape((None, 4, 4, 6))
+        self.assertEqual([s.as_list() for s in shapes],
+                         [[None, 4, 4, 2], [None, 4, 4, 4]])
+
+    def test_split_equal(self):
+        layer = layers.Split(3, axis=1)
+        shapes = layer.compute_output_shape((None, 6, 4, 4))
+        self.assertEqual([s.as_list() for s in shapes], [[None, 2, 4, 4]] * 3)
+
+        with self.assertRaises(ValueError):
+            layer.compute_output_shape((None, 5, 4, 4))
+
+    def test_inverts_concatenate(self):
+        inputs = Input(shape=(4, 4, 6))
+        x, y = layers.Split([1, 5], name='split')(inputs)
+        outputs = Concatenate(axis=-1)([x, y])
+        model = Model(inputs, outputs)
+
+        # the layer should be serializable
+        config = model.get_config()
+        model = Model.from_config(config, custom_objects={
+            'Split': layers.Split})
+
+        images = np.random.random((2, 4, 4, 6))
+        self.assertAllClose(model.predict(images), images)
+
+
+if __name__ == '__main__':
+    test.main()
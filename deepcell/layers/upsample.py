@@ -28,6 +28,7 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import division
 
+import numpy as np
 import tensorflow as tf
 from tensorflow.python.framework import tensor_shape
 from tensorflow.keras.layers import Layer
@@ -53,6 +54,16 @@ class UpsampleLike(Layer):
         super(UpsampleLike, self).__init__(**kwargs)
         self.data_format = conv_utils.normalize_data_format(data_format)
 
+    def _get_target_shape(self, target):
+        """Returns the shape of ``target``, using the static shape wherever
+        it is known so the resize sizes are constants in the graph."""
+        static_shape = target.get_shape().as_list()
+        if None not in static_shape:
+            return static_shape
+        dynamic_shape = tf.shape(target)
+        return [dynamic_shape[i] if dim is None else dim
+                for i, dim in enumerate(static_shape)]
+
     def _resize_drop_axis(self, image, size, axis):
         image_shape = tf.shape(image)
 
@@ -107,7 +118,7 @@ class UpsampleLike(Layer):
 
     def call(self, inputs, **kwargs):
         source, target = inputs
-        target_shape = K.shape(target)
+        target_shape = self._get_target_shape(target)
         if source.get_shape().ndims == 4:
             if self.data_format == 'channels_first':
                 source = tf.transpose(source, (0, 2, 3, 1))
@@ -194,3 +205,144 @@ class Upsample(Layer):
         }
         base_config = super(Upsample, self).get_config()
         return dict(list(base_config.items()) + list(config.items()))
+
+
+class DepthToSpace2D(Layer):
+    """Rearranges data from the channel dimension into blocks of 2D
+    spatial data using ``tf.nn.depth_to_space``.
+
+    Args:
+        block_size (int): The upsampling factor for both spatial dimensions.
+        data_format (str): A string, one of ``channels_last`` (default)
+            or ``channels_first``. The ordering of the dimensions in the
+            inputs. ``channels_last`` corresponds to inputs with shape
+            ``(batch, height, width, channels)`` while ``channels_first``
+            corresponds to inputs with shape
+            ``(batch, channels, height, width)``.
+    """
+
+    def __init__(self, block_size=2, data_format=None, **kwargs):
+        super(DepthToSpace2D, self).__init__(**kwargs)
+        self.block_size = int(block_size)
+        self.data_format = conv_utils.normalize_data_format(data_format)
+
+    def call(self, inputs):
+        if self.data_format == 'channels_first':
+            inputs = tf.transpose(inputs, (0, 2, 3, 1))
+        outputs = tf.nn.depth_to_space(inputs, self.block_size)
+        if self.data_format == 'channels_first':
+            outputs = tf.transpose(outputs, (0, 3, 1, 2))
+        return outputs
+
+    def compute_output_shape(self, input_shape):
+        input_shape = tensor_shape.TensorShape(input_shape).as_list()
+        block_area = self.block_size ** 2
+        if self.data_format == 'channels_first':
+            spatial = input_shape[2:]
+            channels = input_shape[1] // block_area
+        else:
+            spatial = input_shape[1:-1]
+            channels = input_shape[-1] // block_area
+        spatial = [None if d is None else d * self.block_size
+                   for d in spatial]
+        if self.data_format == 'channels_first':
+            output_shape = [input_shape[0], channels] + spatial
+        else:
+            output_shape = [input_shape[0]] + spatial + [channels]
+        return tensor_shape.TensorShape(output_shape)
+
+    def get_config(self):
+        config = {
+            'block_size': self.block_size,
+            'data_format': self.data_format
+        }
+        base_config = super(DepthToSpace2D, self).get_config()
+        return dict(list(base_config.items()) + list(config.items()))
+
+
+class DepthToSpace3D(Layer):
+    """Rearranges data from the channel dimension into blocks of 3D
+    spatial data, the 3D equivalent of ``tf.nn.depth_to_space``.
+
+    A stride-1 convolution with ``prod(block_size)`` times as many filters
+    followed by this layer ("sub-pixel" convolution) can replace a strided
+    ``Conv3DTranspose`` or an ``UpSampling3D`` and convolution pair.
+
+    Args:
+        block_size (tuple): The upsampling factors for each of the
+            ``(z, x, y)`` dimensions.
+        data_format (str): A string, one of ``channels_last`` (default)
+            or ``channels_first``. The ordering of the dimensions in the
+            inputs. ``channels_last`` corresponds to inputs with shape
+            ``(batch, z, height, width, channels)`` while ``channels_first``
+            corresponds to inputs with shape
+            ``(batch, channels, z, height, width)``.
+    """
+
+    def __init__(self, block_size=(1, 2, 2), data_format=None, **kwargs):
+        super(DepthToSpace3D, self).__init__(**kwargs)
+        self.block_size = conv_utils.normalize_tuple(
+            block_size, 3, 'block_size')
+        self.data_format = conv_utils.normalize_data_format(data_format)
+
+    def build(self, input_shape):
+        input_shape = tensor_shape.TensorShape(input_shape)
+        if len(input_shape) != 5:
+            raise ValueError('Inputs should have rank 5, '
+                             'received input shape: %s' % input_shape)
+        channel_axis = 1 if self.data_format == 'channels_first' else -1
+        if input_shape.dims[channel_axis].value is None:
+            raise ValueError('The channel dimension of the inputs '
+                             'should be defined. Found `None`.')
+        block_volume = np.prod(self.block_size)
+        if int(input_shape[channel_axis]) % block_volume != 0:
+            raise ValueError('The number of channels ({}) must be divisible '
+                             'by the block volume ({}).'.format(
+                                 int(input_shape[channel_axis]),
+                                 block_volume))
+        self.built = True
+
+    def call(self, inputs):
+        if self.data_format == 'channels_first':
+            inputs = tf.transpose(inputs, (0, 2, 3, 4, 1))
+
+        bz, bx, by = self.block_size
+        static_shape = inputs.get_shape().as_list()
+        dynamic_shape = tf.shape(inputs)
+        batch, z, x, y = [dynamic_shape[i] if static_shape[i] is None
+                          else static_shape[i] for i in range(4)]
+        channels = static_shape[-1] // (bz * bx * by)
+
+        outputs = tf.reshape(inputs, [batch, z, x, y, bz, bx, by, channels])
+        outputs = tf.transpose(outputs, (0, 1, 4, 2, 5, 3, 6, 7))
+        outputs = tf.reshape(outputs,
+                             [batch, z * bz, x * bx, y * by, channels])
+
+        if self.data_format == 'channels_first':
+            outputs = tf.transpose(outputs, (0, 4, 1, 2, 3))
+        return outputs
+
+    def compute_output_shape(self, input_shape):
+        input_shape = tensor_shape.TensorShape(input_shape).as_list()
+        block_volume = int(np.prod(self.block_size))
+        if self.data_format == 'channels_first':
+            spatial = input_shape[2:]
+            channels = input_shape[1] // block_volume
+        else:
+            spatial = input_shape[1:-1]
+            channels = input_shape[-1] // block_volume
+        spatial = [None if d is None else d * b
+                   for d, b in zip(spatial, self.block_size)]
+        if self.data_format == 'channels_first':
+            output_shape = [input_shape[0], channels] + spatial
+        else:
+            output_shape = [input_shape[0]] + spatial + [channels]
+        return tensor_shape.TensorShape(output_shape)
+
+    def get_config(self):
+        config = {
+            'block_size': self.block_size,
+            'data_format': self.data_format
+        }
+        base_config = super(DepthToSpace3D, self).get_config()
+        return dict(list(base_config.items()) + list(config.items()))
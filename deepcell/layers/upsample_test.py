@@ -29,7 +29,9 @@ from __future__ import print_function
 from __future__ import division
 
 import numpy as np
+import tensorflow as tf
 from tensorflow.keras import backend as K
+from tensorflow.keras.layers import Input
 from tensorflow.python.keras import keras_parameterized
 from tensorflow.python.keras import testing_utils
 from tensorflow.keras.utils import custom_object_scope
@@ -143,6 +145,26 @@ class TestUpsampleLike(keras_parameterized.TestCase):
 
         self.assertAllEqual(actual, expected)
 
+    def test_static_target_shape(self):
+        # static target dimensions are propagated to the output
+        upsample_like_layer = layers.UpsampleLike()
+        source = Input(shape=(2, 2, 1))
+        target = Input(shape=(5, 5, 1))
+        output = upsample_like_layer([source, target])
+        self.assertEqual(output.get_shape().as_list(), [None, 5, 5, 1])
+
+        # a volume resized to a static target shape has the right values
+        upsample_like_layer = layers.UpsampleLike()
+        source = np.arange(8, dtype=K.floatx()).reshape((1, 2, 2, 2, 1))
+        target = np.zeros((1, 4, 4, 4, 1), dtype=K.floatx())
+        expected = source.repeat(2, axis=1).repeat(2, axis=2).repeat(2, axis=3)
+
+        actual = upsample_like_layer.call([K.variable(source),
+                                           K.variable(target)])
+        actual = K.get_value(actual)
+
+        self.assertAllEqual(actual, expected)
+
 
 @keras_parameterized.run_all_keras_modes
 class TestUpsample(keras_parameterized.TestCase):
@@ -160,5 +182,56 @@ class TestUpsample(keras_parameterized.TestCase):
                 input_shape=(3, 4, 5, 6))
 
 
+@keras_parameterized.run_all_keras_modes
+class TestDepthToSpace2D(keras_parameterized.TestCase):
+
+    def test_simple(self):
+        with custom_object_scope({'DepthToSpace2D': layers.DepthToSpace2D}):
+            testing_utils.layer_test(
+                layers.DepthToSpace2D,
+                kwargs={'block_size': 2},
+                input_shape=(3, 4, 5, 8),
+                expected_output_shape=(None, 8, 10, 2))
+            testing_utils.layer_test(
+                layers.DepthToSpace2D,
+                kwargs={'block_size': 2,
+                        'data_format': 'channels_first'},
+                input_shape=(3, 8, 4, 5),
+                expected_output_shape=(None, 2, 8, 10))
+
+
+@keras_parameterized.run_all_keras_modes
+class TestDepthToSpace3D(keras_parameterized.TestCase):
+
+    def test_simple(self):
+        with custom_object_scope({'DepthToSpace3D': layers.DepthToSpace3D}):
+            testing_utils.layer_test(
+                layers.DepthToSpace3D,
+                kwargs={'block_size': (1, 2, 2)},
+                input_shape=(3, 2, 4, 5, 8),
+                expected_output_shape=(None, 2, 8, 10, 2))
+            testing_utils.layer_test(
+                layers.DepthToSpace3D,
+                kwargs={'block_size': (2, 2, 2),
+                        'data_format': 'channels_first'},
+                input_shape=(3, 16, 2, 4, 5),
+                expected_output_shape=(None, 2, 4, 8, 10))
+
+    def test_matches_depth_to_space(self):
+        # each z-slice should match the 2D tf.nn.depth_to_space
+        inputs = np.random.random((2, 3, 4, 4, 12)).astype(K.floatx())
+        layer = layers.DepthToSpace3D(block_size=(1, 2, 2))
+        actual = K.get_value(layer(K.variable(inputs)))
+        self.assertEqual(actual.shape, (2, 3, 8, 8, 3))
+        for z in range(inputs.shape[1]):
+            expected = tf.nn.depth_to_space(inputs[:, z], 2)
+            self.assertAllClose(actual[:, z], K.get_value(expected))
+
+    def test_bad_channels(self):
+        with self.assertRaises(ValueError):
+            layer = layers.DepthToSpace3D(block_size=(2, 2, 2))
+            layer.build((None, 2, 4, 4, 12))
+
+
 if __name__ == '__main__':
     test.main()
@@ -23,7 +23,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
-"""Feature pyramid network utility functions"""
+"""Feature pyramid network utility functions
+
+cuDNN autotuning (see :func:`deepcell.utils.train_utils.enable_cudnn_autotune`)
+benchmarks convolution algorithms once per input shape, so models built
+from these functions run fastest on fixed-size or bucketed inputs.
+"""
 
 from __future__ import absolute_import
 from __future__ import print_function
@@ -31,17 +36,82 @@ from __future__ import division
 
 import re
 
+import tensorflow as tf
 from tensorflow.keras import backend as K
 from tensorflow.keras.models import Model
 from tensorflow.keras.layers import Conv2D, Conv3D, DepthwiseConv2D
+from tensorflow.keras.layers import Conv2DTranspose, Conv3DTranspose
 from tensorflow.keras.layers import Softmax
 from tensorflow.keras.layers import Add
 from tensorflow.keras.layers import Activation
 from tensorflow.keras.layers import UpSampling2D, UpSampling3D
 from tensorflow.keras.layers import BatchNormalization
+from tensorflow.python.platform import tf_logging as logging
 
+from deepcell.initializers import Bilinear
 from deepcell.layers import UpsampleLike
-from deepcell.utils.misc_utils import get_sorted_keys
+from deepcell.layers import WeightedFusion
+from deepcell.layers import DepthToSpace2D, DepthToSpace3D
+
+
+_LEVEL_RE = re.compile(r'\d+')
+
+
+def _sorted_level_items(feature_dict):
+    """Parses the level of each key of ``feature_dict`` once.
+
+    Args:
+        feature_dict (dict): A dictionary of features keyed by names
+            with a level number, e.g. ``{'C3': C3, 'C4': C4, ...}``
+
+    Returns:
+        list: ``(level, name, feature)`` tuples sorted by ascending level.
+    """
+    items = [(int(_LEVEL_RE.search(name).group()), name, feature)
+             for name, feature in feature_dict.items()]
+    return sorted(items, key=lambda item: item[0])
+
+
+def _round_up(n, multiple):
+    """Rounds ``n`` up to the nearest multiple of ``multiple``."""
+    return -(-n // multiple) * multiple
+
+
+def _get_pyramid_final_layer(feature_size,
+                             ndim=2,
+                             lite=False,
+                             grouped_conv=False,
+                             z_axis_convolutions=False,
+                             kernel_initializer='glorot_uniform',
+                             name=None):
+    """Get the 3x3 convolution applied to each merged pyramid level.
+
+    See :func:`create_pyramid_level` for a description of the arguments.
+
+    Returns:
+        tensorflow.keras.layers.Layer: The convolution layer.
+    """
+    if ndim == 3:
+        z = 3 if z_axis_convolutions else 1
+        return Conv3D(feature_size, (z, 3, 3), strides=(1, 1, 1),
+                      padding='same', data_format='channels_last',
+                      kernel_initializer=kernel_initializer,
+                      name=name)
+
+    if lite and grouped_conv:
+        return Conv2D(feature_size, (3, 3), strides=(1, 1),
+                      padding='same', groups=feature_size,
+                      kernel_initializer=kernel_initializer,
+                      name=name)
+
+    if lite:
+        return DepthwiseConv2D((3, 3), strides=(1, 1), padding='same',
+                               depthwise_initializer=kernel_initializer,
+                               name=name)
+
+    return Conv2D(feature_size, (3, 3), strides=(1, 1), padding='same',
+                  kernel_initializer=kernel_initializer,
+                  name=name)
 
 
 def create_pyramid_level(backbone_input,
@@ -53,7 +123,11 @@ def create_pyramid_level(backbone_input,
                          lite=False,
                          interpolation='bilinear',
                          feature_size=256,
-                         z_axis_convolutions=False):
+                         z_axis_convolutions=False,
+                         kernel_initializer='glorot_uniform',
+                         grouped_conv=False,
+                         final_layer=None,
+                         weighted_fusion=False):
     """Create a pyramid layer from a particular backbone input layer.
 
     Args:
@@ -73,6 +147,19 @@ def create_pyramid_level(backbone_input,
             feature pyramid construction
         interpolation (str): Choice of interpolation mode for upsampling
             layers from ``['bilinear', 'nearest']``.
+        z_axis_convolutions (bool): Whether or not to do convolutions on
+            3D data across the z axis.
+        kernel_initializer (str): Initializer for the convolution kernels,
+            e.g. ``'he_normal'`` for the ReLU networks built here.
+        grouped_conv (bool): Whether the lite model uses an equivalent
+            grouped ``Conv2D`` with one group per channel instead of a
+            ``DepthwiseConv2D``, which can be much faster on GPU under XLA.
+            Grouped convolutions are only supported on GPU.
+        final_layer (tensorflow.keras.layers.Layer): Optional layer to use
+            for the final 3x3 convolution, e.g. to share it between levels.
+        weighted_fusion (bool): Whether to merge the ``addition_input``
+            with a learned :class:`deepcell.layers.WeightedFusion` instead
+            of a plain ``Add``.
 
     Returns:
         tuple: Pyramid layer after processing, upsampled pyramid layer
@@ -114,18 +201,26 @@ def create_pyramid_level(backbone_input,
     # Apply 1x1 conv to backbone layer
     if ndim == 2:
         pyramid = Conv2D(feature_size, (1, 1), strides=(1, 1),
-                         padding='same', name=reduced_name)(backbone_input)
+                         padding='same',
+                         kernel_initializer=kernel_initializer,
+                         name=reduced_name)(backbone_input)
     else:
         pyramid = Conv3D(feature_size, (1, 1, 1), strides=(1, 1, 1),
-                         padding='same', name=reduced_name)(backbone_input)
+                         padding='same', data_format='channels_last',
+                         kernel_initializer=kernel_initializer,
+                         name=reduced_name)(backbone_input)
 
     # Add and then 3x3 conv
     if addition_input is not None:
-        pyramid = Add(name=addition_name)([pyramid, addition_input])
+        merge = WeightedFusion if weighted_fusion else Add
+        pyramid = merge(name=addition_name)([pyramid, addition_input])
 
     # Upsample pyramid input
     if upsamplelike_input is not None and upsample_type == 'upsamplelike':
-        pyramid_upsample = UpsampleLike(name=upsample_name)(
+        # 3D layers are always channels_last to use the NDHWC cuDNN kernels
+        data_format = None if ndim == 2 else 'channels_last'
+        pyramid_upsample = UpsampleLike(data_format=data_format,
+                                        name=upsample_name)(
             [pyramid, upsamplelike_input])
     elif upsample_type == 'upsamplelike':
         pyramid_upsample = None
@@ -139,20 +234,15 @@ def create_pyramid_level(backbone_input,
         }
         if ndim > 2:
             del upsampling_kwargs['interpolation']
+            upsampling_kwargs['data_format'] = 'channels_last'
         pyramid_upsample = upsampling(**upsampling_kwargs)(pyramid)
 
-    if ndim == 2:
-        if lite:
-            pyramid_final = DepthwiseConv2D((3, 3), strides=(1, 1),
-                                            padding='same',
-                                            name=final_name)(pyramid)
-        else:
-            pyramid_final = Conv2D(feature_size, (3, 3), strides=(1, 1),
-                                   padding='same', name=final_name)(pyramid)
-    else:
-        z = 3 if z_axis_convolutions else 1
-        pyramid_final = Conv3D(feature_size, (z, 3, 3), strides=(1, 1, 1),
-                               padding='same', name=final_name)(pyramid)
+    if final_layer is None:
+        final_layer = _get_pyramid_final_layer(
+            feature_size, ndim=ndim, lite=lite, grouped_conv=grouped_conv,
+            z_axis_convolutions=z_axis_convolutions,
+            kernel_initializer=kernel_initializer, name=final_name)
+    pyramid_final = final_layer(pyramid)
 
     return pyramid_final, pyramid_upsample
 
@@ -164,7 +254,11 @@ def __create_pyramid_features(backbone_dict,
                               lite=False,
                               upsample_type='upsamplelike',
                               interpolation='bilinear',
-                              z_axis_convolutions=False):
+                              z_axis_convolutions=False,
+                              kernel_initializer='glorot_uniform',
+                              grouped_conv=False,
+                              shared_pyramid_head=False,
+                              weighted_fusion=False):
     """Creates the FPN layers on top of the backbone features.
 
     Args:
@@ -181,6 +275,18 @@ def __create_pyramid_features(backbone_dict,
             from ``['upsamplelike','upsamling2d','upsampling3d']``.
         interpolation (str): Choice of interpolation mode for upsampling
             layers from ``['bilinear', 'nearest']``.
+        z_axis_convolutions (bool): Whether or not to do convolutions on
+            3D data across the z axis.
+        kernel_initializer (str): Initializer for the convolution kernels.
+        grouped_conv (bool): Whether the lite model uses grouped convolutions
+            instead of depthwise convolutions.
+            See :func:`create_pyramid_level`.
+        shared_pyramid_head (bool): Whether to share the final 3x3
+            convolution between the levels built from the backbone, as in
+            FPN variants with a shared head. The shared layer is named
+            ``'P_shared'``, so the levels no longer have their own layers.
+        weighted_fusion (bool): Whether to merge the levels with learned
+            weights. See :func:`create_pyramid_level`.
 
     Returns:
         dict: The feature pyramid names and levels,
@@ -217,24 +323,30 @@ def __create_pyramid_features(backbone_dict,
                          'Choose from {}.'.format(
                              upsample_type, list(acceptable_upsample)))
 
-    # Get names of the backbone levels and place in ascending order
-    backbone_names = get_sorted_keys(backbone_dict)
-    backbone_features = [backbone_dict[name] for name in backbone_names]
+    if lite and not grouped_conv and tf.config.optimizer.get_jit():
+        logging.warning('DepthwiseConv2D can be much slower than Conv2D '
+                        'when compiled with XLA on GPU. Consider using '
+                        '`grouped_conv=True` for lite feature pyramids.')
+
+    # Get the backbone levels, names and features in descending order
+    backbone_items = _sorted_level_items(backbone_dict)[::-1]
+    backbone_features = [feature for _, _, feature in backbone_items]
+
+    if shared_pyramid_head:
+        final_layer = _get_pyramid_final_layer(
+            feature_size, ndim=ndim, lite=lite, grouped_conv=grouped_conv,
+            z_axis_convolutions=z_axis_convolutions,
+            kernel_initializer=kernel_initializer, name='P_shared')
+    else:
+        final_layer = None
 
     pyramid_names = []
     pyramid_finals = []
     pyramid_upsamples = []
 
-    # Reverse lists
-    backbone_names.reverse()
-    backbone_features.reverse()
-
-    for i, N in enumerate(backbone_names):
-        level = int(re.findall(r'\d+', N)[0])
+    for i, (level, _, backbone_input) in enumerate(backbone_items):
         pyramid_names.append('P{}'.format(level))
 
-        backbone_input = backbone_features[i]
-
         # Don't add for the bottom of the pyramid
         if i == 0:
             if len(backbone_features) > 1:
@@ -244,7 +356,7 @@ def __create_pyramid_features(backbone_dict,
             addition_input = None
 
         # Don't upsample for the top of the pyramid
-        elif i == len(backbone_names) - 1:
+        elif i == len(backbone_items) - 1:
             upsamplelike_input = None
             addition_input = pyramid_upsamples[-1]
 
@@ -261,7 +373,11 @@ def __create_pyramid_features(backbone_dict,
                                       ndim=ndim,
                                       lite=lite,
                                       interpolation=interpolation,
-                                      z_axis_convolutions=z_axis_convolutions)
+                                      z_axis_convolutions=z_axis_convolutions,
+                                      kernel_initializer=kernel_initializer,
+                                      grouped_conv=grouped_conv,
+                                      final_layer=final_layer,
+                                      weighted_fusion=weighted_fusion)
         pyramid_finals.append(pf)
         pyramid_upsamples.append(pu)
 
@@ -269,18 +385,20 @@ def __create_pyramid_features(backbone_dict,
     if include_final_layers:
         # "Second to last pyramid layer is obtained via a
         # 3x3 stride-2 conv on the coarsest backbone"
-        N = backbone_names[0]
-        F = backbone_features[0]
-        level = int(re.findall(r'\d+', N)[0]) + 1
+        coarsest_level, N, F = backbone_items[0]
+        level = coarsest_level + 1
         P_minus_2_name = 'P{}'.format(level)
 
         if ndim == 2:
             P_minus_2 = Conv2D(feature_size, kernel_size=(3, 3),
                                strides=(2, 2), padding='same',
+                               kernel_initializer=kernel_initializer,
                                name=P_minus_2_name)(F)
         else:
             P_minus_2 = Conv3D(feature_size, kernel_size=(1, 3, 3),
                                strides=(1, 2, 2), padding='same',
+                               data_format='channels_last',
+                               kernel_initializer=kernel_initializer,
                                name=P_minus_2_name)(F)
 
         pyramid_names.insert(0, P_minus_2_name)
@@ -288,17 +406,22 @@ def __create_pyramid_features(backbone_dict,
 
         # "Last pyramid layer is computed by applying ReLU
         # followed by a 3x3 stride-2 conv on second to last layer"
-        level = int(re.findall(r'\d+', N)[0]) + 2
+        # The second to last layer is itself a pyramid output and must not
+        # be activated, so the ReLU cannot be fused into its convolution.
+        level = coarsest_level + 2
         P_minus_1_name = 'P{}'.format(level)
         P_minus_1 = Activation('relu', name='{}_relu'.format(N))(P_minus_2)
 
         if ndim == 2:
             P_minus_1 = Conv2D(feature_size, kernel_size=(3, 3),
                                strides=(2, 2), padding='same',
+                               kernel_initializer=kernel_initializer,
                                name=P_minus_1_name)(P_minus_1)
         else:
             P_minus_1 = Conv3D(feature_size, kernel_size=(1, 3, 3),
                                strides=(1, 2, 2), padding='same',
+                               data_format='channels_last',
+                               kernel_initializer=kernel_initializer,
                                name=P_minus_1_name)(P_minus_1)
 
         pyramid_names.insert(0, P_minus_1_name)
@@ -316,7 +439,10 @@ def semantic_upsample(x,
                       ndim=2,
                       semantic_id=0,
                       upsample_type='upsamplelike',
-                      interpolation='bilinear'):
+                      interpolation='bilinear',
+                      subpixel=False,
+                      transpose=False,
+                      kernel_initializer='glorot_uniform'):
     """Performs iterative rounds of 2x upsampling and
     convolutions with a 3x3 filter to remove aliasing effects.
 
@@ -333,6 +459,18 @@ def semantic_upsample(x,
             ``['upsamplelike', 'upsampling2d', 'upsampling3d']``.
         interpolation (str): Choice of interpolation mode for upsampling
             layers from ``['bilinear', 'nearest']``.
+        subpixel (bool): Whether to replace each convolution and upsampling
+            layer pair with a single convolution with 4x the filters
+            followed by a depth to space rearrangement.
+            Not compatible with ``'upsamplelike'``.
+        transpose (bool): Whether to replace each convolution and upsampling
+            layer pair with a single strided transposed convolution,
+            initialized to bilinear upsampling added to
+            ``kernel_initializer`` when the number of channels changes.
+            This avoids convolving the 4x larger upsampled tensor.
+            Only compatible with ``'bilinear'`` interpolation and not
+            with ``'upsamplelike'`` or ``subpixel``.
+        kernel_initializer (str): Initializer for the convolution kernels.
 
     Raises:
         ValueError: ``ndim`` is not 2 or 3.
@@ -341,6 +479,11 @@ def semantic_upsample(x,
             ``['upsamplelike','upsampling2d', 'upsampling3d']``.
         ValueError: ``target`` is ``None`` and
             ``upsample_type`` is ``'upsamplelike'``
+        ValueError: ``subpixel`` is ``True`` and
+            ``upsample_type`` is ``'upsamplelike'``
+        ValueError: ``transpose`` is ``True`` and ``upsample_type`` is
+            ``'upsamplelike'``, ``interpolation`` is ``'nearest'``
+            or ``subpixel`` is ``True``
 
     Returns:
         tensor: The upsampled tensor.
@@ -368,24 +511,68 @@ def semantic_upsample(x,
     if upsample_type == 'upsamplelike' and target is None:
         raise ValueError('upsamplelike requires a target.')
 
+    if subpixel and upsample_type == 'upsamplelike':
+        raise ValueError('subpixel upsampling is not compatible '
+                         'with upsamplelike.')
+
+    if transpose and (upsample_type == 'upsamplelike' or subpixel
+                      or interpolation != 'bilinear'):
+        raise ValueError('transposed convolution upsampling is only '
+                         'compatible with bilinear interpolation and '
+                         'not with upsamplelike or subpixel.')
+
     conv = Conv2D if ndim == 2 else Conv3D
     conv_kernel = (3, 3) if ndim == 2 else (1, 3, 3)
     upsampling = UpSampling2D if ndim == 2 else UpSampling3D
     size = (2, 2) if ndim == 2 else (1, 2, 2)
 
+    # 3D layers are always channels_last to use the NDHWC cuDNN kernels
+    data_format = None if ndim == 2 else 'channels_last'
+
     if n_upsample > 0:
         for i in range(n_upsample):
-            x = conv(n_filters, conv_kernel, strides=1, padding='same',
-                     name='conv_{}_semantic_upsample_{}'.format(
-                         i, semantic_id))(x)
-
             # Define kwargs for upsampling layer
             upsample_name = 'upsampling_{}_semantic_upsample_{}'.format(
                 i, semantic_id)
 
+            if subpixel:
+                # One conv with 4x the filters and a depth to space
+                # rearrangement instead of a conv on the upsampled tensor
+                x = conv(n_filters * 4, conv_kernel, strides=1,
+                         padding='same', data_format=data_format,
+                         kernel_initializer=kernel_initializer,
+                         name='conv_{}_semantic_upsample_{}'.format(
+                             i, semantic_id))(x)
+                if ndim == 2:
+                    x = DepthToSpace2D(block_size=2, name=upsample_name)(x)
+                else:
+                    x = DepthToSpace3D(block_size=size,
+                                       data_format=data_format,
+                                       name=upsample_name)(x)
+                continue
+
+            if transpose:
+                # A strided transposed conv in place of a conv followed
+                # by bilinear upsampling
+                conv_transpose = Conv2DTranspose if ndim == 2 else Conv3DTranspose
+                transpose_kernel = (4, 4) if ndim == 2 else (1, 4, 4)
+                x = conv_transpose(n_filters, transpose_kernel, strides=size,
+                                   padding='same', data_format=data_format,
+                                   kernel_initializer=Bilinear(kernel_initializer),
+                                   name='conv_transpose_{}_semantic_upsample_{}'.format(
+                                       i, semantic_id))(x)
+                continue
+
+            x = conv(n_filters, conv_kernel, strides=1, padding='same',
+                     data_format=data_format,
+                     kernel_initializer=kernel_initializer,
+                     name='conv_{}_semantic_upsample_{}'.format(
+                         i, semantic_id))(x)
+
             if upsample_type == 'upsamplelike':
                 if i == n_upsample - 1 and target is not None:
-                    x = UpsampleLike(name=upsample_name)([x, target])
+                    x = UpsampleLike(data_format=data_format,
+                                     name=upsample_name)([x, target])
             else:
                 upsampling_kwargs = {
                     'size': size,
@@ -395,15 +582,19 @@ def semantic_upsample(x,
 
                 if ndim > 2:
                     del upsampling_kwargs['interpolation']
+                    upsampling_kwargs['data_format'] = data_format
                 x = upsampling(**upsampling_kwargs)(x)
     else:
         x = conv(n_filters, conv_kernel, strides=1, padding='same',
+                 data_format=data_format,
+                 kernel_initializer=kernel_initializer,
                  name='conv_final_semantic_upsample_{}'.format(semantic_id))(x)
 
         if upsample_type == 'upsamplelike' and target is not None:
             upsample_name = 'upsampling_{}_semanticupsample_{}'.format(
                 0, semantic_id)
-            x = UpsampleLike(name=upsample_name)([x, target])
+            x = UpsampleLike(data_format=data_format,
+                             name=upsample_name)([x, target])
 
     return x
 
@@ -419,6 +610,13 @@ def __create_semantic_head(pyramid_dict,
                            target_level=2,
                            upsample_type='upsamplelike',
                            interpolation='bilinear',
+                           subpixel=False,
+                           transpose=False,
+                           kernel_initializer='glorot_uniform',
+                           channel_multiple=None,
+                           use_bias_before_bn=True,
+                           bn_scale=True,
+                           return_logits=False,
                            **kwargs):
     """Creates a semantic head from a feature pyramid network.
 
@@ -438,6 +636,28 @@ def __create_semantic_head(pyramid_dict,
             ``['upsamplelike', 'upsampling2d', 'upsampling3d']``.
         interpolation (str): Choice of interpolation mode for upsampling
             layers from ``['bilinear', 'nearest']``.
+        subpixel (bool): Whether to upsample with sub-pixel convolutions.
+            See :func:`semantic_upsample`.
+        transpose (bool): Whether to upsample with transposed convolutions.
+            See :func:`semantic_upsample`.
+        kernel_initializer (str): Initializer for the convolution kernels.
+        channel_multiple (int): If set, ``n_dense`` is rounded up to a
+            multiple of this value so the convolutions can use Tensor Cores,
+            e.g. 8 for ``float16`` or 4 for TF32.
+            The ``n_classes`` outputs are not padded.
+        use_bias_before_bn (bool): Whether the convolution followed by
+            ``BatchNormalization`` has a bias. The bias is redundant with the
+            normalization offset, so ``False`` saves a bias add, but the
+            head then has different weights than existing checkpoints.
+        bn_scale (bool): Whether the ``BatchNormalization`` has a scale.
+            As it is followed by a ReLU and a linear convolution, the scale
+            is redundant and ``False`` saves a multiply, but the head then
+            has different weights than existing checkpoints.
+        return_logits (bool): Whether to return the logits instead of
+            applying the final ``Softmax`` when ``include_top`` is ``True``,
+            so it can be fused into a loss computed ``from_logits``,
+            e.g. :func:`deepcell.losses.categorical_crossentropy`.
+            The weights are unchanged.
 
     Raises:
         ValueError: ``ndim`` must be 2 or 3
@@ -474,7 +694,10 @@ def __create_semantic_head(pyramid_dict,
     conv = Conv2D if ndim == 2 else Conv3D
     conv_kernel = (1,) * ndim
 
-    if K.image_data_format() == 'channels_first':
+    # 3D layers are always channels_last to use the NDHWC cuDNN kernels
+    data_format = None if ndim == 2 else 'channels_last'
+
+    if K.image_data_format() == 'channels_first' and ndim == 2:
         channel_axis = 1
     else:
         channel_axis = -1
@@ -482,13 +705,12 @@ def __create_semantic_head(pyramid_dict,
     if n_classes == 1:
         include_top = False
 
-    # Get pyramid names and features into list form
-    pyramid_names = get_sorted_keys(pyramid_dict)
-    pyramid_features = [pyramid_dict[name] for name in pyramid_names]
+    if channel_multiple:
+        n_dense = _round_up(n_dense, channel_multiple)
 
-    # Reverse pyramid names and features
-    pyramid_names.reverse()
-    pyramid_features.reverse()
+    # Get the pyramid levels, names and features in descending order
+    pyramid_items = _sorted_level_items(pyramid_dict)[::-1]
+    pyramid_features = [feature for _, _, feature in pyramid_items]
 
     # Previous method of building feature pyramids
     # semantic_features, semantic_names = [], []
@@ -523,20 +745,31 @@ def __create_semantic_head(pyramid_dict,
                           # n_filters=n_filters,  # TODO: uncomment and retrain
                           target=input_target, ndim=ndim,
                           upsample_type=upsample_type, semantic_id=semantic_id,
-                          interpolation=interpolation)
+                          interpolation=interpolation, subpixel=subpixel,
+                          transpose=transpose,
+                          kernel_initializer=kernel_initializer)
 
     # Apply conv in place of previous tensor product
     x = conv(n_dense, conv_kernel, strides=1, padding='same',
+             data_format=data_format,
+             use_bias=use_bias_before_bn,
+             kernel_initializer=kernel_initializer,
              name='conv_0_semantic_{}'.format(semantic_id))(x)
-    x = BatchNormalization(axis=channel_axis,
+    x = BatchNormalization(axis=channel_axis, scale=bn_scale,
                            name='batch_normalization_0_semantic_{}'.format(semantic_id))(x)
     x = Activation('relu', name='relu_0_semantic_{}'.format(semantic_id))(x)
 
     # Apply conv and softmax layer
     x = conv(n_classes, conv_kernel, strides=1,
-             padding='same', name='conv_1_semantic_{}'.format(semantic_id))(x)
+             padding='same', data_format=data_format,
+             kernel_initializer=kernel_initializer,
+             name='conv_1_semantic_{}'.format(semantic_id))(x)
 
-    if include_top:
+    if include_top and return_logits:
+        x = Activation('linear',
+                       dtype=K.floatx(),
+                       name='semantic_{}'.format(semantic_id))(x)
+    elif include_top:
         x = Softmax(axis=channel_axis,
                     dtype=K.floatx(),
                     name='semantic_{}'.format(semantic_id))(x)
@@ -0,0 +1,70 @@
+# Copyright 2016-2020 The Van Valen Lab at the California Institute of
+# Technology (Caltech), with support from the Paul Allen Family Foundation,
+# Google, & National Institutes of Health (NIH) under Grant U24CA224309-01.
+# All rights reserved.
+#
+# Licensed under a modified Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.github.com/vanvalenlab/deepcell-tf/LICENSE
+#
+# The Work provided may be used for non-commercial academic purposes only.
+# For any other use of the Work, including commercial use, please contact:
+# vanvalenlab@gmail.com
+#
+# Neither the name of Caltech nor the names of its contributors may be used
+# to endorse or promote products derived from this software without specific
+# prior written permission.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Test the feature pyramid functions."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+
+from tensorflow.keras import backend as K
+from tensorflow.keras.layers import Input
+from tensorflow.keras.models import Model
+from tensorflow.python.keras import keras_parameterized
+from tensorflow.python.platform import test
+
+from deepcell.model_zoo import fpn
+
+
+class CreatePyramidLevelTest(keras_parameterized.TestCase):
+
+    def test_create_pyramid_level_3d_upsamplelike(self):
+        # 3D pyramids are always channels_last
+        K.set_image_data_format('channels_first')
+        self.addCleanup(K.set_image_data_format, 'channels_last')
+
+        backbone_input = Input(shape=(3, 8, 8, 4))
+        upsamplelike_input = Input(shape=(3, 16, 16, 4))
+        pyramid_final, pyramid_upsample = fpn.create_pyramid_level(
+            backbone_input,
+            upsamplelike_input=upsamplelike_input,
+            upsample_type='upsamplelike',
+            level=4,
+            ndim=3,
+            feature_size=8)
+
+        self.assertEqual(pyramid_final.get_shape().as_list(),
+                         [None, 3, 8, 8, 8])
+
+        model = Model([backbone_input, upsamplelike_input], pyramid_upsample)
+        outputs = model.predict([np.random.random((1, 3, 8, 8, 4)),
+                                 np.random.random((1, 3, 16, 16, 4))])
+        self.assertEqual(outputs.shape, (1, 3, 16, 16, 8))
+
+
+if __name__ == '__main__':
+    test.main()
@@ -29,19 +29,24 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import division
 
+import contextlib
+import functools
+import inspect
 import math
-import re
 
 from tensorflow.keras import backend as K
+from tensorflow.keras.mixed_precision import experimental as mixed_precision
 from tensorflow.keras.models import Model
 from tensorflow.keras.layers import Conv2D, Conv3D
 from tensorflow.keras.layers import TimeDistributed, ConvLSTM2D
 from tensorflow.keras.layers import Input, Concatenate
 from tensorflow.keras.layers import Activation, BatchNormalization
+from tensorflow.python.platform import tf_logging as logging
 
 from deepcell.layers import ConvGRU2D
 from deepcell.layers import ImageNormalization2D, Location2D
 from deepcell.model_zoo.fpn import __create_pyramid_features
+from deepcell.model_zoo.fpn import _sorted_level_items
 from deepcell.model_zoo.fpn import __create_semantic_head
 from deepcell.utils.backbone_utils import get_backbone
 
@@ -112,6 +117,39 @@ def __merge_temporal_features(feature, mode='conv', feature_size=256,
     return temporal_feature
 
 
+@contextlib.contextmanager
+def _dtype_policy_scope(dtype_policy):
+    """Sets the global mixed precision policy to ``dtype_policy``
+    and restores the previous policy on exit, even if an error is raised.
+    Does nothing if ``dtype_policy`` is ``None``.
+    """
+    if dtype_policy is None:
+        yield
+        return
+
+    previous_policy = mixed_precision.global_policy()
+    mixed_precision.set_policy(dtype_policy)
+    try:
+        yield
+    finally:
+        mixed_precision.set_policy(previous_policy)
+
+
+def _with_dtype_policy(builder):
+    """Builds the model inside a :func:`_dtype_policy_scope` for the
+    ``dtype_policy`` argument of ``builder``."""
+    signature = inspect.signature(builder)
+
+    @functools.wraps(builder)
+    def wrapper(*args, **kwargs):
+        arguments = signature.bind(*args, **kwargs).arguments
+        with _dtype_policy_scope(arguments.get('dtype_policy')):
+            return builder(*args, **kwargs)
+
+    return wrapper
+
+
+@_with_dtype_policy
 def PanopticNet(backbone,
                 input_shape,
                 inputs=None,
@@ -128,10 +166,17 @@ def PanopticNet(backbone,
                 location=True,
                 use_imagenet=True,
                 lite=False,
+                grouped_conv=False,
+                shared_pyramid_head=False,
+                weighted_fusion=False,
                 upsample_type='upsampling2d',
                 interpolation='bilinear',
+                pyramid_interpolation=None,
                 name='panopticnet',
                 z_axis_convolutions=False,
+                dtype_policy=None,
+                skip_channel_projection=False,
+                kernel_initializer='glorot_uniform',
                 **kwargs):
     """Constructs a Mask-RCNN model using a backbone from
     ``keras-applications`` with optional semantic segmentation transforms.
@@ -155,15 +200,29 @@ def PanopticNet(backbone,
             for each semantic head.
         norm_method (str): Normalization method to use with the
             :mod:`deepcell.layers.normalization.ImageNormalization2D` layer.
+            If ``None`` (default), no normalization layer is added and the
+            inputs should be normalized in the data pipeline, which keeps
+            this parameter-free work off the accelerator.
         location (bool): Whether to include a
             :mod:`deepcell.layers.location.Location2D` layer.
         use_imagenet (bool): Whether to load imagenet-based pretrained weights.
         lite (bool): Whether to use a depthwise conv in the feature pyramid
             rather than regular conv.
+        grouped_conv (bool): Whether the lite feature pyramid uses grouped
+            convolutions instead of depthwise convolutions, which can be
+            much faster on GPU under XLA. Only supported on GPU.
+        shared_pyramid_head (bool): Whether the pyramid levels built from
+            the backbone share their final 3x3 convolution.
+        weighted_fusion (bool): Whether the feature pyramid merges levels
+            with learned, normalized weights as in EfficientDet.
         upsample_type (str): Choice of upsampling layer to use from
             ``['upsamplelike', 'upsampling2d', 'upsampling3d']``.
         interpolation (str): Choice of interpolation mode for upsampling
             layers from ``['bilinear', 'nearest']``.
+        pyramid_interpolation (str): Optional interpolation mode for the
+            feature pyramid only. ``'nearest'`` is cheaper than
+            ``'bilinear'`` and the following 3x3 convolutions can learn
+            the smoothing. Defaults to ``interpolation``.
         pooling (str): optional pooling mode for feature extraction
             when ``include_top`` is ``False``.
 
@@ -181,6 +240,17 @@ def PanopticNet(backbone,
             3D data across the z axis.
         required_channels (int): The required number of channels of the
             backbone.  3 is the default for all current backbones.
+        dtype_policy (str): Optional mixed precision policy used to build
+            the model, e.g. ``'mixed_float16'``. The input normalization
+            and the semantic heads always use ``float32``.
+            The global policy is restored afterwards.
+        skip_channel_projection (bool): Whether to skip the 1x1 convolution
+            that projects the inputs to ``required_channels`` when they
+            already have ``required_channels`` channels, saving a pass over
+            the full resolution inputs.
+        kernel_initializer (str): Initializer for the convolution kernels
+            of the feature pyramid and the semantic heads,
+            e.g. ``'he_normal'``.
         kwargs (dict): Other standard inputs for ``retinanet_mask``.
 
     Raises:
@@ -190,6 +260,11 @@ def PanopticNet(backbone,
         tensorflow.keras.Model: Panoptic model with a backbone.
     """
     channel_axis = 1 if K.image_data_format() == 'channels_first' else -1
+    if channel_axis == 1:
+        logging.warning('PanopticNet is being built with channels_first '
+                        'layers. The fast cuDNN Tensor Core convolutions '
+                        'use channels_last (NHWC), so channels_first models '
+                        'may be slower on GPU, especially with float16.')
     conv = Conv3D if frames_per_batch > 1 else Conv2D
     conv_kernel = (1, 1, 1) if frames_per_batch > 1 else (1, 1)
 
@@ -232,14 +307,17 @@ def PanopticNet(backbone,
             inputs = Input(shape=input_shape, name='input_0')
 
     # Normalize input images
+    # The normalization statistics are always computed in full precision
     if norm_method is None:
         norm = inputs
     else:
         if frames_per_batch > 1:
             norm = TimeDistributed(ImageNormalization2D(
-                norm_method=norm_method, name='norm'), name='td_norm')(inputs)
+                norm_method=norm_method, dtype=K.floatx(), name='norm'),
+                dtype=K.floatx(), name='td_norm')(inputs)
         else:
             norm = ImageNormalization2D(norm_method=norm_method,
+                                        dtype=K.floatx(),
                                         name='norm')(inputs)
 
     # Add location layer
@@ -256,11 +334,15 @@ def PanopticNet(backbone,
         concat = norm
 
     # Force the channel size for backbone input to be `required_channels`
-    fixed_inputs = conv(required_channels, conv_kernel, strides=1,
-                        padding='same', name='conv_channels')(concat)
+    in_channels = K.int_shape(concat)[channel_axis]
+    if skip_channel_projection and in_channels == required_channels:
+        fixed_inputs = concat
+    else:
+        fixed_inputs = conv(required_channels, conv_kernel, strides=1,
+                            padding='same', name='conv_channels')(concat)
 
     # Force the input shape
-    axis = 0 if K.image_data_format() == 'channels_first' else -1
+    axis = 0 if channel_axis == 1 else -1
     fixed_input_shape = list(input_shape)
     fixed_input_shape[axis] = required_channels
     fixed_input_shape = tuple(fixed_input_shape)
@@ -283,12 +365,31 @@ def PanopticNet(backbone,
 
     ndim = 2 if frames_per_batch == 1 else 3
 
+    if pyramid_interpolation is None:
+        pyramid_interpolation = interpolation
+
+    # Only pass the newer options when they are set, so that custom
+    # create_pyramid_features and create_semantic_head functions
+    # written for the original arguments keep working.
+    head_kwargs = {}
+    if kernel_initializer != 'glorot_uniform':
+        head_kwargs['kernel_initializer'] = kernel_initializer
+
+    pyramid_kwargs = dict(head_kwargs)
+    if grouped_conv:
+        pyramid_kwargs['grouped_conv'] = grouped_conv
+    if shared_pyramid_head:
+        pyramid_kwargs['shared_pyramid_head'] = shared_pyramid_head
+    if weighted_fusion:
+        pyramid_kwargs['weighted_fusion'] = weighted_fusion
+
     pyramid_dict = create_pyramid_features(backbone_dict_reduced,
                                            ndim=ndim,
                                            lite=lite,
-                                           interpolation=interpolation,
+                                           interpolation=pyramid_interpolation,
                                            upsample_type=upsample_type,
-                                           z_axis_convolutions=z_axis_convolutions)
+                                           z_axis_convolutions=z_axis_convolutions,
+                                           **pyramid_kwargs)
 
     features = [pyramid_dict[key] for key in pyramid_levels]
 
@@ -300,18 +401,18 @@ def PanopticNet(backbone,
         for f, k in zip(temporal_features, pyramid_levels):
             pyramid_dict[k] = f
 
-    semantic_levels = [int(re.findall(r'\d+', k)[0]) for k in pyramid_dict]
-    target_level = min(semantic_levels)
+    # upsample the semantic heads from the finest pyramid level
+    target_level = _sorted_level_items(pyramid_dict)[0][0]
 
-    semantic_head_list = []
-    for i, c in enumerate(num_semantic_classes):
-        semantic_head_list.append(create_semantic_head(
+    outputs = [
+        create_semantic_head(
             pyramid_dict, n_classes=c,
             input_target=inputs, target_level=target_level,
             semantic_id=i, ndim=ndim, upsample_type=upsample_type,
-            interpolation=interpolation, **kwargs))
-
-    outputs = semantic_head_list
+            interpolation=interpolation, **head_kwargs, **kwargs)
+        for i, c in enumerate(num_semantic_classes)
+    ]
 
     model = Model(inputs=inputs, outputs=outputs, name=name)
+
     return model
@@ -29,12 +29,41 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import numpy as np
+
 from absl.testing import parameterized
 
 from tensorflow.keras import backend as K
+from tensorflow.keras import initializers
+from tensorflow.keras.mixed_precision import experimental as mixed_precision
+from tensorflow.keras.layers import Conv2D
 from tensorflow.python.keras import keras_parameterized
 
+from deepcell.layers import WeightedFusion
 from deepcell.model_zoo import PanopticNet
+from deepcell.model_zoo.fpn import __create_pyramid_features
+from deepcell.model_zoo.fpn import __create_semantic_head
+
+
+def _create_pyramid_features(backbone_dict, ndim=2, lite=False,
+                             interpolation='bilinear',
+                             upsample_type='upsamplelike',
+                             z_axis_convolutions=False):
+    """A custom pyramid function with the original arguments."""
+    return __create_pyramid_features(
+        backbone_dict, ndim=ndim, lite=lite, interpolation=interpolation,
+        upsample_type=upsample_type, z_axis_convolutions=z_axis_convolutions)
+
+
+def _create_semantic_head(pyramid_dict, input_target=None, n_classes=3,
+                          semantic_id=0, ndim=2, target_level=2,
+                          upsample_type='upsamplelike',
+                          interpolation='bilinear'):
+    """A custom semantic head function with the original arguments."""
+    return __create_semantic_head(
+        pyramid_dict, input_target=input_target, n_classes=n_classes,
+        semantic_id=semantic_id, ndim=ndim, target_level=target_level,
+        upsample_type=upsample_type, interpolation=interpolation)
 
 
 class PanopticNetTest(keras_parameterized.TestCase):
@@ -376,6 +405,306 @@ class PanopticNetTest(keras_parameterized.TestCase):
             for i, s in enumerate(num_semantic_classes):
                 self.assertEqual(model.output_shape[i][axis], s)
 
+    def test_panopticnet_mixed_precision(self):
+        K.set_image_data_format('channels_last')
+        num_semantic_classes = [1, 3]
+        policy = mixed_precision.global_policy().name
+
+        model = PanopticNet(
+            backbone='featurenet',
+            input_shape=(32, 32, 1),
+            norm_method='std',
+            location=True,
+            num_semantic_classes=num_semantic_classes,
+            use_imagenet=False,
+            dtype_policy='mixed_float16',
+        )
+
+        # the global policy is restored after the model is built
+        self.assertEqual(mixed_precision.global_policy().name, policy)
+        # the normalization is not computed in float16
+        self.assertEqual(model.get_layer('norm').output.dtype, 'float32')
+        # the semantic heads are always float32
+        for output in model.outputs:
+            self.assertEqual(output.dtype, 'float32')
+
+    def test_panopticnet_mixed_precision_bad_input(self):
+        K.set_image_data_format('channels_last')
+        policy = mixed_precision.global_policy().name
+
+        with self.assertRaises(ValueError):
+            PanopticNet(
+                backbone='bad_backbone',
+                input_shape=(32, 32, 1),
+                norm_method=None,
+                num_semantic_classes=[3],
+                use_imagenet=False,
+                dtype_policy='mixed_float16',
+            )
+
+        # the global policy is restored even if the build fails
+        self.assertEqual(mixed_precision.global_policy().name, policy)
+
+    @parameterized.named_parameters([
+        {'testcase_name': 'subpixel_2d', 'frames_per_batch': 1},
+        {'testcase_name': 'subpixel_3d', 'frames_per_batch': 3},
+    ])
+    def test_panopticnet_subpixel(self, frames_per_batch):
+        K.set_image_data_format('channels_last')
+        num_semantic_classes = [1, 3]
+
+        model = PanopticNet(
+            backbone='featurenet',
+            input_shape=(32, 32, 1),
+            frames_per_batch=frames_per_batch,
+            norm_method=None,
+            location=False,
+            upsample_type='upsampling2d',
+            num_semantic_classes=num_semantic_classes,
+            use_imagenet=False,
+            subpixel=True,
+        )
+
+        for i, s in enumerate(num_semantic_classes):
+            self.assertEqual(model.output_shape[i][-1], s)
+            self.assertEqual(model.output_shape[i][-3:-1], (32, 32))
+
+    @parameterized.named_parameters([
+        {'testcase_name': 'transpose_2d', 'frames_per_batch': 1},
+        {'testcase_name': 'transpose_3d', 'frames_per_batch': 3},
+    ])
+    def test_panopticnet_transpose(self, frames_per_batch):
+        K.set_image_data_format('channels_last')
+        num_semantic_classes = [1, 3]
+
+        model = PanopticNet(
+            backbone='featurenet',
+            input_shape=(32, 32, 1),
+            frames_per_batch=frames_per_batch,
+            norm_method=None,
+            location=False,
+            upsample_type='upsampling2d',
+            num_semantic_classes=num_semantic_classes,
+            use_imagenet=False,
+            transpose=True,
+        )
+
+        for i, s in enumerate(num_semantic_classes):
+            self.assertEqual(model.output_shape[i][-1], s)
+            self.assertEqual(model.output_shape[i][-3:-1], (32, 32))
+
+        with self.assertRaises(ValueError):
+            PanopticNet(
+                backbone='featurenet',
+                input_shape=(32, 32, 1),
+                norm_method=None,
+                location=False,
+                upsample_type='upsampling2d',
+                interpolation='nearest',
+                use_imagenet=False,
+                transpose=True,
+            )
+
+    def test_panopticnet_transpose_widths(self):
+        K.set_image_data_format('channels_last')
+        # the 256 channel pyramid level is upsampled to 64 filters
+        model = PanopticNet(
+            backbone='featurenet',
+            input_shape=(32, 32, 1),
+            norm_method=None,
+            upsample_type='upsampling2d',
+            num_semantic_classes=[3],
+            use_imagenet=False,
+            transpose=True,
+        )
+        layer = model.get_layer('conv_transpose_0_semantic_upsample_0')
+        kernel = K.get_value(layer.kernel)
+        # (*spatial, filters, channels)
+        self.assertEqual(kernel.shape[-2:], (64, 256))
+        # the channels off the diagonal are not initialized to zero
+        self.assertTrue(np.any(kernel[..., 64:]))
+        self.assertTrue(np.any(kernel[..., 0, 1]))
+
+    def test_panopticnet_skip_channel_projection(self):
+        K.set_image_data_format('channels_last')
+
+        def get_layer_names(**kwargs):
+            model = PanopticNet(
+                backbone='featurenet',
+                norm_method=None,
+                use_imagenet=False,
+                skip_channel_projection=True,
+                **kwargs)
+            return [layer.name for layer in model.layers]
+
+        # skipped when the inputs already have the required channels
+        self.assertNotIn('conv_channels', get_layer_names(
+            input_shape=(32, 32, 3), location=False))
+        self.assertNotIn('conv_channels', get_layer_names(
+            input_shape=(32, 32, 1), location=True, required_channels=3))
+        # kept otherwise
+        self.assertIn('conv_channels', get_layer_names(
+            input_shape=(32, 32, 1), location=False))
+
+    def test_panopticnet_grouped_conv(self):
+        K.set_image_data_format('channels_last')
+        model = PanopticNet(
+            backbone='featurenet',
+            input_shape=(32, 32, 1),
+            norm_method=None,
+            location=False,
+            lite=True,
+            grouped_conv=True,
+            use_imagenet=False,
+        )
+        # building is supported on any device, running only on GPU
+        layer = model.get_layer('P3')
+        self.assertIsInstance(layer, Conv2D)
+        self.assertEqual(layer.groups, layer.filters)
+
+    def test_panopticnet_no_bias_before_bn(self):
+        K.set_image_data_format('channels_last')
+        model = PanopticNet(
+            backbone='featurenet',
+            input_shape=(32, 32, 1),
+            norm_method=None,
+            num_semantic_classes=[1, 3],
+            use_imagenet=False,
+            use_bias_before_bn=False,
+        )
+        for i in range(2):
+            layer = model.get_layer('conv_0_semantic_{}'.format(i))
+            self.assertFalse(layer.use_bias)
+
+    def test_panopticnet_no_bn_scale(self):
+        K.set_image_data_format('channels_last')
+        model = PanopticNet(
+            backbone='featurenet',
+            input_shape=(32, 32, 1),
+            norm_method=None,
+            num_semantic_classes=[1, 3],
+            use_imagenet=False,
+            bn_scale=False,
+        )
+        for i in range(2):
+            layer = model.get_layer(
+                'batch_normalization_0_semantic_{}'.format(i))
+            self.assertIsNone(layer.gamma)
+
+    @parameterized.named_parameters([
+        {'testcase_name': 'shared_2d', 'frames_per_batch': 1},
+        {'testcase_name': 'shared_3d', 'frames_per_batch': 3},
+    ])
+    def test_panopticnet_shared_pyramid_head(self, frames_per_batch):
+        K.set_image_data_format('channels_last')
+        model = PanopticNet(
+            backbone='featurenet',
+            input_shape=(32, 32, 1),
+            frames_per_batch=frames_per_batch,
+            norm_method=None,
+            num_semantic_classes=[1, 3],
+            use_imagenet=False,
+            shared_pyramid_head=True,
+        )
+        layer_names = [layer.name for layer in model.layers]
+        self.assertIn('P_shared', layer_names)
+        for level in ['P3', 'P4', 'P5']:
+            self.assertNotIn(level, layer_names)
+        # P6 and P7 are strided and keep their own layers
+        self.assertIn('P6', layer_names)
+        self.assertIn('P7', layer_names)
+
+    def test_panopticnet_return_logits(self):
+        K.set_image_data_format('channels_last')
+        model = PanopticNet(
+            backbone='featurenet',
+            input_shape=(32, 32, 1),
+            norm_method=None,
+            num_semantic_classes=[1, 3],
+            use_imagenet=False,
+            include_top=True,
+            return_logits=True,
+        )
+        # the regression head keeps its relu, the softmax is dropped
+        self.assertEqual(model.get_layer('semantic_0').activation.__name__,
+                         'relu')
+        self.assertEqual(model.get_layer('semantic_1').activation.__name__,
+                         'linear')
+        self.assertEqual(model.output_shape[1][-1], 3)
+
+    def test_panopticnet_pyramid_interpolation(self):
+        K.set_image_data_format('channels_last')
+        model = PanopticNet(
+            backbone='featurenet',
+            input_shape=(32, 32, 1),
+            norm_method=None,
+            num_semantic_classes=[3],
+            use_imagenet=False,
+            upsample_type='upsampling2d',
+            interpolation='bilinear',
+            pyramid_interpolation='nearest',
+        )
+        self.assertEqual(model.get_layer('P5_upsampled').interpolation,
+                         'nearest')
+        self.assertEqual(
+            model.get_layer('upsampling_0_semantic_upsample_0').interpolation,
+            'bilinear')
+
+    def test_panopticnet_weighted_fusion(self):
+        K.set_image_data_format('channels_last')
+        model = PanopticNet(
+            backbone='featurenet',
+            input_shape=(32, 32, 1),
+            norm_method=None,
+            num_semantic_classes=[3],
+            use_imagenet=False,
+            weighted_fusion=True,
+        )
+        for level in ['P3', 'P4']:
+            layer = model.get_layer('{}_merged'.format(level))
+            self.assertIsInstance(layer, WeightedFusion)
+
+    def test_panopticnet_channel_multiple(self):
+        K.set_image_data_format('channels_last')
+        model = PanopticNet(
+            backbone='featurenet',
+            input_shape=(32, 32, 1),
+            norm_method=None,
+            num_semantic_classes=[3],
+            use_imagenet=False,
+            n_dense=30,
+            channel_multiple=8,
+        )
+        self.assertEqual(model.get_layer('conv_0_semantic_0').filters, 32)
+
+    def test_panopticnet_kernel_initializer(self):
+        K.set_image_data_format('channels_last')
+        model = PanopticNet(
+            backbone='featurenet',
+            input_shape=(32, 32, 1),
+            norm_method=None,
+            num_semantic_classes=[3],
+            use_imagenet=False,
+            kernel_initializer='he_normal',
+        )
+        for name in ['P3', 'conv_0_semantic_0']:
+            initializer = model.get_layer(name).kernel_initializer
+            self.assertIsInstance(initializer, initializers.HeNormal)
+
+    def test_panopticnet_custom_builders(self):
+        K.set_image_data_format('channels_last')
+        # the newer options are not passed to the builders by default
+        model = PanopticNet(
+            backbone='featurenet',
+            input_shape=(32, 32, 1),
+            norm_method=None,
+            num_semantic_classes=[3],
+            use_imagenet=False,
+            create_pyramid_features=_create_pyramid_features,
+            create_semantic_head=_create_semantic_head,
+        )
+        self.assertEqual(model.output_shape[-1], 3)
+
     def test_panopticnet_bad_input(self):
 
         norm_method = None
@@ -29,8 +29,6 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-import re
-
 from tensorflow.keras import backend as K
 from tensorflow.keras.models import Model
 from tensorflow.keras.layers import Conv2D, Conv3D, TimeDistributed
@@ -47,6 +45,7 @@ from deepcell.layers import Anchors, RegressBoxes, ClipBoxes
 from deepcell.utils.retinanet_anchor_utils import AnchorParameters
 from deepcell.model_zoo.fpn import __create_semantic_head
 from deepcell.model_zoo.fpn import __create_pyramid_features
+from deepcell.model_zoo.fpn import _sorted_level_items
 from deepcell.utils.backbone_utils import get_backbone
 
 
@@ -387,8 +386,8 @@ def retinanet(inputs,
     object_head = __build_pyramid(submodels, features)
 
     if panoptic:
-        semantic_levels = [int(re.findall(r'\d+', k)[0]) for k in pyramid_dict]
-        target_level = min(semantic_levels)
+        # upsample the semantic heads from the finest pyramid level
+        target_level = _sorted_level_items(pyramid_dict)[0][0]
 
         semantic_head_list = []
         for i in range(num_semantic_heads):
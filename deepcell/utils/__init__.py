@@ -49,6 +49,9 @@ from deepcell.utils import retinanet_anchor_utils
 # Globally-importable utils.
 from deepcell.utils.data_utils import get_data
 from deepcell.utils.export_utils import export_model
+from deepcell.utils.export_utils import build_serving_fn
+from deepcell.utils.export_utils import fold_batch_normalization
+from deepcell.utils.export_utils import merge_sibling_convolutions
 from deepcell.utils.misc_utils import sorted_nicely
 from deepcell.utils.train_utils import rate_scheduler
 from deepcell.utils.transform_utils import outer_distance_transform_2d
@@ -29,10 +29,15 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import division
 
+import collections
+import copy
+import inspect
+import json
 import os
 import numpy as np
 import tensorflow as tf
 
+from tensorflow.keras import backend as K
 from tensorflow.python.platform import tf_logging
 
 
@@ -68,6 +73,314 @@ def export_model(keras_model, export_path, model_version=0, weights_path=None,
     )
 
 
+def build_serving_fn(model, batch_size=None, experimental_compile=True):
+    """Trace a model for inference with a fixed input signature.
+
+    The returned ``tf.function`` is traced once for the model's input shape,
+    avoiding the Python overhead of calling the model for each batch.
+    With ``experimental_compile``, the whole graph is compiled with XLA.
+    It can also be passed as the ``signatures`` of
+    ``tf.keras.models.save_model``.
+
+    Args:
+        model (tensorflow.keras.Model): Instantiated Keras model with
+            fully defined input shapes, e.g. a ``PanopticNet``.
+        batch_size (int): Optional fixed batch size. If ``None``,
+            any batch size is accepted without retracing.
+        experimental_compile (bool): Whether to compile the function
+            with XLA.
+
+    Returns:
+        tensorflow.python.eager.def_function.Function: The serving function.
+    """
+    input_signature = [
+        tf.TensorSpec([batch_size] + x.shape[1:].as_list(), dtype=x.dtype)
+        for x in model.inputs
+    ]
+
+    def serve(*inputs):
+        inputs = list(inputs) if len(inputs) > 1 else inputs[0]
+        return model(inputs, training=False)
+
+    return tf.function(serve, input_signature=input_signature,
+                       experimental_compile=experimental_compile)
+
+
+_FOLDABLE_CONVS = {'Conv2D', 'Conv3D', 'DepthwiseConv2D'}
+_MERGEABLE_CONVS = {'Conv2D', 'Conv3D'}
+
+
+def _get_custom_objects(custom_objects=None):
+    """Get the layers of ``deepcell.layers`` and any other custom objects
+    needed to rebuild a model from its config."""
+    # imported here as deepcell.layers depends on deepcell.utils
+    from deepcell import layers
+
+    objects = {name: obj for name, obj in inspect.getmembers(layers)
+               if inspect.isclass(obj)}
+    objects.update(custom_objects or {})
+    return objects
+
+
+def _get_foldable_pairs(layer_configs, output_names):
+    """Find the convolutions whose only consumer is a BatchNormalization
+    layer over the convolution's channel axis.
+
+    Args:
+        layer_configs (list): The ``'layers'`` of a functional model config.
+        output_names (set): Names of the layers that are model outputs,
+            which are never folded.
+
+    Returns:
+        dict: The names of the BatchNormalization layers mapped to the
+        names of the convolutions they normalize.
+    """
+    by_name = {config['name']: config for config in layer_configs}
+    consumers = collections.Counter(
+        inbound[0]
+        for config in layer_configs
+        for node in config['inbound_nodes']
+        for inbound in node)
+
+    pairs = {}
+    for config in layer_configs:
+        if config['class_name'] != 'BatchNormalization':
+            continue
+        if len(config['inbound_nodes']) != 1:
+            continue
+        node = config['inbound_nodes'][0]
+        if len(node) != 1:
+            continue
+
+        conv = by_name[node[0][0]]
+        conv_name = conv['name']
+        if conv['class_name'] not in _FOLDABLE_CONVS:
+            continue
+        if len(conv['inbound_nodes']) != 1 or consumers[conv_name] != 1:
+            continue
+        if conv_name in output_names:
+            continue
+        if conv['config'].get('activation', 'linear') != 'linear':
+            continue
+
+        # the normalized axis must be the convolution's channel axis
+        rank = len(conv['config']['kernel_size']) + 2
+        if conv['config']['data_format'] == 'channels_first':
+            channel_axis = 1
+        else:
+            channel_axis = rank - 1
+        axis = config['config']['axis']
+        if isinstance(axis, (list, tuple)):
+            if len(axis) != 1:
+                continue
+            axis = axis[0]
+        if axis % rank != channel_axis:
+            continue
+
+        pairs[config['name']] = conv_name
+    return pairs
+
+
+def fold_batch_normalization(model, custom_objects=None):
+    """Fold ``BatchNormalization`` layers into the preceding convolutions
+    of a functional model for faster inference.
+
+    Each ``Conv2D``, ``Conv3D`` or ``DepthwiseConv2D`` layer whose output
+    only feeds a ``BatchNormalization`` layer gets the normalization folded
+    into its kernel and bias. The ``BatchNormalization`` layer is replaced
+    by a linear ``Activation`` with the same name, so the rest of the
+    model is unchanged. The returned model should only be used for
+    inference.
+
+    Args:
+        model (tensorflow.keras.Model): A functional model.
+        custom_objects (dict): Custom layers used by ``model``. Layers
+            from ``deepcell.layers`` are included automatically.
+
+    Returns:
+        tensorflow.keras.Model: A new model with the folded weights.
+    """
+    config = model.get_config()
+    output_names = {output[0] for output in config['output_layers']}
+    pairs = _get_foldable_pairs(config['layers'], output_names)
+
+    for layer_config in config['layers']:
+        if layer_config['name'] in pairs:
+            bn_config = layer_config['config']
+            layer_config['class_name'] = 'Activation'
+            layer_config['config'] = {
+                'name': bn_config['name'],
+                'trainable': False,
+                'dtype': bn_config['dtype'],
+                'activation': 'linear',
+            }
+        elif layer_config['name'] in pairs.values():
+            layer_config['config']['use_bias'] = True
+
+    folded_model = model.__class__.from_config(
+        config, custom_objects=_get_custom_objects(custom_objects))
+
+    folded_convs = {v: k for k, v in pairs.items()}
+    for layer in folded_model.layers:
+        if layer.name in pairs:
+            continue
+
+        original = model.get_layer(layer.name)
+        if layer.name not in folded_convs:
+            layer.set_weights(original.get_weights())
+            continue
+
+        bn = model.get_layer(folded_convs[layer.name])
+        gamma = 1 if bn.gamma is None else K.get_value(bn.gamma)
+        beta = 0 if bn.beta is None else K.get_value(bn.beta)
+        mean = K.get_value(bn.moving_mean)
+        variance = K.get_value(bn.moving_variance)
+        scale = gamma / np.sqrt(variance + bn.epsilon)
+
+        kernel = original.get_weights()[0]
+        if original.use_bias:
+            bias = original.get_weights()[1]
+        else:
+            bias = np.zeros_like(mean)
+
+        # the last axis of the kernel indexes the output channels,
+        # except for depthwise kernels (..., in_channels, multiplier)
+        if layer.__class__.__name__ == 'DepthwiseConv2D':
+            kernel = kernel * np.reshape(scale, kernel.shape[-2:])
+        else:
+            kernel = kernel * scale
+        bias = (bias - mean) * scale + beta
+
+        layer.set_weights([kernel.astype(original.dtype),
+                           bias.astype(original.dtype)])
+
+    return folded_model
+
+
+def _get_sibling_groups(layer_configs, output_names):
+    """Find the groups of convolutions that read the same tensor and only
+    differ in their number of filters.
+
+    Args:
+        layer_configs (list): The ``'layers'`` of a functional model config.
+        output_names (set): Names of the layers that are model outputs,
+            which are never merged.
+
+    Returns:
+        list: Lists of the names of the sibling convolutions.
+    """
+    groups = collections.OrderedDict()
+    for config in layer_configs:
+        if config['class_name'] not in _MERGEABLE_CONVS:
+            continue
+        if config['name'] in output_names:
+            continue
+        if len(config['inbound_nodes']) != 1:
+            continue
+        node = config['inbound_nodes'][0]
+        if len(node) != 1:
+            continue
+
+        conv_config = {k: v for k, v in config['config'].items()
+                       if k not in {'name', 'filters'}}
+        key = (config['class_name'],
+               json.dumps(node[0], sort_keys=True, default=str),
+               json.dumps(conv_config, sort_keys=True, default=str))
+        groups.setdefault(key, []).append(config['name'])
+
+    return [names for names in groups.values() if len(names) > 1]
+
+
+def merge_sibling_convolutions(model, custom_objects=None):
+    """Merge convolutions that read the same tensor into a single
+    convolution followed by a ``Split`` layer.
+
+    Convolutions that share an input and only differ in their number of
+    filters, e.g. the first convolution of each semantic head of a
+    ``PanopticNet``, are computed by one convolution with the concatenated
+    kernels, so their input is only read once. The merged convolution is
+    named after the first convolution of each group, with a ``_merged``
+    suffix. The returned model should only be used for inference.
+
+    Args:
+        model (tensorflow.keras.Model): A functional model.
+        custom_objects (dict): Custom layers used by ``model``. Layers
+            from ``deepcell.layers`` are included automatically.
+
+    Returns:
+        tensorflow.keras.Model: A new model with the merged convolutions.
+    """
+    config = model.get_config()
+    output_names = {output[0] for output in config['output_layers']}
+    groups = _get_sibling_groups(config['layers'], output_names)
+
+    by_name = {layer_config['name']: layer_config
+               for layer_config in config['layers']}
+    group_by_name = {name: names for names in groups for name in names}
+
+    merged_names = {}  # the merged convolution for each group
+    split_outputs = {}  # the split layer and output index of each sibling
+    layer_configs = []
+    for layer_config in config['layers']:
+        names = group_by_name.get(layer_config['name'])
+        if names is None:
+            layer_configs.append(layer_config)
+            continue
+        if layer_config['name'] != names[0]:
+            continue
+
+        filters = [by_name[name]['config']['filters'] for name in names]
+        conv_config = layer_config['config']
+        merged_name = '{}_merged'.format(names[0])
+        split_name = '{}_split'.format(names[0])
+
+        merged_config = copy.deepcopy(layer_config)
+        merged_config['name'] = merged_name
+        merged_config['config']['name'] = merged_name
+        merged_config['config']['filters'] = sum(filters)
+
+        axis = 1 if conv_config['data_format'] == 'channels_first' else -1
+        split_config = {
+            'class_name': 'Split',
+            'name': split_name,
+            'config': {
+                'name': split_name,
+                'trainable': conv_config['trainable'],
+                'dtype': conv_config['dtype'],
+                'num_or_size_splits': filters,
+                'axis': axis,
+            },
+            'inbound_nodes': [[[merged_name, 0, 0, {}]]],
+        }
+        layer_configs.extend([merged_config, split_config])
+
+        merged_names[merged_name] = names
+        for i, name in enumerate(names):
+            split_outputs[name] = (split_name, i)
+
+    # feed the consumers of each sibling from the split layer
+    for layer_config in layer_configs:
+        for node in layer_config['inbound_nodes']:
+            for inbound in node:
+                if inbound[0] in split_outputs:
+                    inbound[0], inbound[2] = split_outputs[inbound[0]]
+
+    config['layers'] = layer_configs
+    merged_model = model.__class__.from_config(
+        config, custom_objects=_get_custom_objects(custom_objects))
+
+    for layer in merged_model.layers:
+        if layer.name in merged_names:
+            weights = [model.get_layer(name).get_weights()
+                       for name in merged_names[layer.name]]
+            layer.set_weights([np.concatenate(w, axis=-1)
+                               for w in zip(*weights)])
+        elif layer.weights:
+            layer.set_weights(model.get_layer(layer.name).get_weights())
+
+    return merged_model
+
+
 def export_model_to_tflite(model_file, export_path, calibration_images,
                            norm=True, location=True, file_name='model.tflite'):
     """Export a saved keras model to tensorflow-lite with int8 precision.
@@ -132,6 +445,7 @@ def export_model_to_tflite(model_file, export_path, calibration_images,
 
     # Save converted model
     save_path = os.path.join(export_path, file_name)
-    open(save_path, "wb").write(tflite_quant_model)
+    with open(save_path, 'wb') as f:
+        f.write(tflite_model)
 
     return tflite_model
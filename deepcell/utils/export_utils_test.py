@@ -0,0 +1,183 @@
+# Copyright 2016-2020 The Van Valen Lab at the California Institute of
+# Technology (Caltech), with support from the Paul Allen Family Foundation,
+# Google, & National Institutes of Health (NIH) under Grant U24CA224309-01.
+# All rights reserved.
+#
+# Licensed under a modified Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.github.com/vanvalenlab/deepcell-tf/LICENSE
+#
+# The Work provided may be used for non-commercial academic purposes only.
+# For any other use of the Work, including commercial use, please contact:
+# vanvalenlab@gmail.com
+#
+# Neither the name of Caltech nor the names of its contributors may be used
+# to endorse or promote products derived from this software without specific
+# prior written permission.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for export_utils"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+
+import numpy as np
+from tensorflow.keras import backend as K
+from tensorflow.keras.layers import Input, Activation, BatchNormalization
+from tensorflow.keras.layers import Conv2D, Conv3D, DepthwiseConv2D
+from tensorflow.keras.models import Model
+from tensorflow.python.platform import test
+
+from deepcell.utils import export_utils
+
+
+def _randomize_batch_normalization(model):
+    for layer in model.layers:
+        if isinstance(layer, BatchNormalization):
+            shape = layer.moving_mean.shape
+            layer.set_weights([
+                np.random.uniform(0.5, 1.5, shape),  # gamma
+                np.random.uniform(-1, 1, shape),  # beta
+                np.random.uniform(-1, 1, shape),  # moving mean
+                np.random.uniform(0.5, 1.5, shape),  # moving variance
+            ])
+
+
+class ExportUtilsTest(test.TestCase):
+
+    def test_build_serving_fn(self):
+        K.set_image_data_format('channels_last')
+        inputs = Input(shape=(16, 16, 3))
+        x = Conv2D(4, (3, 3), padding='same', name='conv_0')(inputs)
+        x = BatchNormalization(axis=-1, name='bn_0')(x)
+        model = Model(inputs, x)
+
+        serving_fn = export_utils.build_serving_fn(
+            model, experimental_compile=False)
+
+        images = np.random.random((2, 16, 16, 3)).astype('float32')
+        self.assertAllClose(serving_fn(images), model.predict(images),
+                            rtol=1e-5, atol=1e-5)
+        # any batch size is accepted
+        self.assertAllClose(serving_fn(images[:1]), model.predict(images[:1]),
+                            rtol=1e-5, atol=1e-5)
+
+        # a fixed batch size is enforced
+        serving_fn = export_utils.build_serving_fn(
+            model, batch_size=2, experimental_compile=False)
+        self.assertAllClose(serving_fn(images), model.predict(images),
+                            rtol=1e-5, atol=1e-5)
+        with self.assertRaises(ValueError):
+            serving_fn(images[:1])
+
+    def test_export_model_to_tflite(self):
+        K.set_image_data_format('channels_last')
+        inputs = Input(shape=(16, 16, 1))
+        x = Conv2D(4, (3, 3), padding='same', name='conv_0')(inputs)
+        x = BatchNormalization(axis=-1, name='bn_0')(x)
+        x = Activation('relu', name='relu_0')(x)
+        model = Model(inputs, x)
+
+        export_path = self.get_temp_dir()
+        model_file = os.path.join(export_path, 'model.h5')
+        model.save(model_file)
+
+        calibration_images = np.random.random((4, 16, 16, 1))
+        tflite_model = export_utils.export_model_to_tflite(
+            model_file, export_path, calibration_images,
+            norm=True, location=False, file_name='test.tflite')
+
+        save_path = os.path.join(export_path, 'test.tflite')
+        self.assertTrue(os.path.isfile(save_path))
+        with open(save_path, 'rb') as f:
+            self.assertEqual(f.read(), tflite_model)
+
+    def test_fold_batch_normalization(self):
+        K.set_image_data_format('channels_last')
+        inputs = Input(shape=(16, 16, 3))
+        x = Conv2D(8, (3, 3), padding='same', name='conv_0')(inputs)
+        x = BatchNormalization(axis=-1, name='bn_0')(x)
+        x = Activation('relu', name='relu_0')(x)
+        x = DepthwiseConv2D((3, 3), depth_multiplier=2, padding='same',
+                            use_bias=False, name='dconv_1')(x)
+        x = BatchNormalization(axis=-1, name='bn_1')(x)
+        # a convolution with two consumers must not be folded
+        y = Conv2D(4, (1, 1), name='conv_2')(x)
+        z = BatchNormalization(axis=-1, name='bn_2')(y)
+        # a convolution that is also a model output must not be folded
+        w = Conv2D(4, (1, 1), name='conv_3')(x)
+        v = BatchNormalization(axis=-1, name='bn_3')(w)
+        outputs = [z, Activation('relu', name='relu_2')(y), w, v]
+        model = Model(inputs, outputs)
+        _randomize_batch_normalization(model)
+
+        folded = export_utils.fold_batch_normalization(model)
+
+        layer_types = {layer.name: layer.__class__.__name__
+                       for layer in folded.layers}
+        self.assertEqual(layer_types['bn_0'], 'Activation')
+        self.assertEqual(layer_types['bn_1'], 'Activation')
+        self.assertEqual(layer_types['bn_2'], 'BatchNormalization')
+        self.assertEqual(layer_types['bn_3'], 'BatchNormalization')
+        self.assertTrue(folded.get_layer('dconv_1').use_bias)
+
+        images = np.random.random((2, 16, 16, 3))
+        expected = model.predict(images)
+        actual = folded.predict(images)
+        for e, a in zip(expected, actual):
+            self.assertAllClose(e, a, rtol=1e-4, atol=1e-4)
+
+    def test_fold_batch_normalization_3d(self):
+        inputs = Input(shape=(3, 16, 16, 2))
+        x = Conv3D(4, (1, 3, 3), padding='same', data_format='channels_last',
+                   name='conv_0')(inputs)
+        x = BatchNormalization(axis=-1, name='bn_0')(x)
+        model = Model(inputs, x)
+        _randomize_batch_normalization(model)
+
+        folded = export_utils.fold_batch_normalization(model)
+        self.assertIsInstance(folded.get_layer('bn_0'), Activation)
+
+        images = np.random.random((2, 3, 16, 16, 2))
+        self.assertAllClose(model.predict(images), folded.predict(images),
+                            rtol=1e-4, atol=1e-4)
+
+    def test_merge_sibling_convolutions(self):
+        K.set_image_data_format('channels_last')
+        inputs = Input(shape=(16, 16, 3))
+        x = Conv2D(4, (3, 3), padding='same', name='conv_0')(inputs)
+        y = Conv2D(8, (3, 3), padding='same', name='conv_1')(inputs)
+        # different kernel sizes are not merged
+        z = Conv2D(8, (1, 1), padding='same', name='conv_2')(inputs)
+        x = Activation('relu', name='relu_0')(x)
+        y = Activation('relu', name='relu_1')(y)
+        model = Model(inputs, [x, y, z])
+
+        merged = export_utils.merge_sibling_convolutions(model)
+
+        layer_names = {layer.name for layer in merged.layers}
+        self.assertIn('conv_0_merged', layer_names)
+        self.assertIn('conv_0_split', layer_names)
+        self.assertIn('conv_2', layer_names)
+        self.assertNotIn('conv_0', layer_names)
+        self.assertNotIn('conv_1', layer_names)
+        self.assertEqual(merged.get_layer('conv_0_merged').filters, 12)
+
+        images = np.random.random((2, 16, 16, 3))
+        expected = model.predict(images)
+        actual = merged.predict(images)
+        for e, a in zip(expected, actual):
+            self.assertAllClose(e, a, rtol=1e-5, atol=1e-5)
+
+
+if __name__ == '__main__':
+    test.main()
@@ -29,9 +29,13 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import division
 
+import os
+
 import numpy as np
+import tensorflow as tf
 from tensorflow.keras import callbacks
 from tensorflow.python.client import device_lib
+from tensorflow.python.platform import tf_logging as logging
 
 
 def get_callbacks(model_path,
@@ -108,3 +112,83 @@ def count_gpus():
     devices = device_lib.list_local_devices()
     gpus = [d for d in devices if d.name.lower().startswith('/device:gpu')]
     return len(gpus)
+
+
+def enable_tensor_float_32_execution(enabled=True):
+    """Allow float32 convolutions and matrix multiplications to run
+    on Tensor Cores using TensorFloat-32 (TF32) precision.
+
+    Only GPUs with compute capability 8.0 (Ampere) or higher support TF32,
+    other devices ignore this setting. This should be called before any
+    models are built.
+
+    Args:
+        enabled (bool): Whether to enable or disable TF32 execution.
+
+    Returns:
+        bool: Whether TF32 execution was configured. ``False`` if the
+        installed version of TensorFlow does not support TF32.
+    """
+    value = '1' if enabled else '0'
+    os.environ['TF_ENABLE_CUDNN_TENSOR_OP_MATH_FP32'] = value
+    os.environ['TF_ENABLE_CUBLAS_TENSOR_OP_MATH_FP32'] = value
+    os.environ['TF_ENABLE_CUDNN_RNN_TENSOR_OP_MATH_FP32'] = value
+
+    set_tf32 = getattr(tf.config.experimental,
+                       'enable_tensor_float_32_execution', None)
+    if set_tf32 is None:
+        logging.warning('TensorFloat-32 is not supported by TensorFlow %s.',
+                        tf.__version__)
+        return False
+
+    set_tf32(enabled)
+
+    for gpu in tf.config.list_physical_devices('GPU'):
+        details = tf.config.experimental.get_device_details(gpu)
+        capability = details.get('compute_capability', (0, 0))
+        supported = enabled and tuple(capability) >= (8, 0)
+        logging.info('TensorFloat-32 execution is %s on %s '
+                     '(compute capability %s).',
+                     'active' if supported else 'inactive',
+                     details.get('device_name', gpu.name), capability)
+
+    return True
+
+
+def enable_cudnn_autotune(enabled=True):
+    """Let cuDNN benchmark the available convolution algorithms for each
+    new input shape and use the fastest, which is often a Tensor Core
+    algorithm the default heuristics would not choose.
+
+    Autotuning runs once per unique shape, so models should be run on
+    fixed-size (or bucketed) inputs to benefit. Deterministic cuDNN ops
+    disable autotuning and are turned off when ``enabled`` is ``True``.
+    This should be called before any models are built.
+
+    Args:
+        enabled (bool): Whether to enable or disable cuDNN autotuning.
+    """
+    os.environ['TF_CUDNN_USE_AUTOTUNE'] = '1' if enabled else '0'
+    if enabled:
+        os.environ['TF_CUDNN_DETERMINISTIC'] = '0'
+
+
+def enable_xla(enabled=True):
+    """Enable XLA auto-clustering for all graphs, including the
+    ``tf.function`` graphs built by ``model.fit`` and ``model.predict``.
+
+    XLA fuses chains of small ops, such as the convolution, batch
+    normalization and ReLU layers of the feature pyramid and semantic
+    heads, into fewer kernels. Setting the environment variable
+    ``TF_XLA_FLAGS=--tf_xla_auto_jit=2`` has the same effect without
+    any code changes.
+
+    XLA compiles each new input shape, so models should be built with a
+    fully defined ``input_shape`` (and ``frames_per_batch``) and trained
+    on fixed-size batches. Depthwise convolutions, as used by ``lite``
+    feature pyramids, may be slower under XLA on some GPUs.
+
+    Args:
+        enabled (bool): Whether to enable or disable XLA auto-clustering.
+    """
+    tf.config.optimizer.set_jit(enabled)
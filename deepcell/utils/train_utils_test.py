@@ -29,7 +29,9 @@ from __future__ import division
 from __future__ import print_function
 
 import os
+from unittest import mock
 
+import tensorflow as tf
 from tensorflow.keras import callbacks
 from tensorflow.python.platform import test
 
@@ -69,5 +71,32 @@ class TrainUtilsTest(test.TestCase):
         rs = train_utils.rate_scheduler(lr=.001, decay=1)
         self.assertEqual(rs(1), rs(2))
 
+    @mock.patch.dict(os.environ)
+    def test_enable_tensor_float_32_execution(self):
+        train_utils.enable_tensor_float_32_execution(False)
+        self.assertEqual(os.environ['TF_ENABLE_CUDNN_TENSOR_OP_MATH_FP32'], '0')
+        self.assertEqual(os.environ['TF_ENABLE_CUBLAS_TENSOR_OP_MATH_FP32'], '0')
+
+        train_utils.enable_tensor_float_32_execution(True)
+        self.assertEqual(os.environ['TF_ENABLE_CUDNN_TENSOR_OP_MATH_FP32'], '1')
+        self.assertEqual(os.environ['TF_ENABLE_CUBLAS_TENSOR_OP_MATH_FP32'], '1')
+
+    @mock.patch.dict(os.environ)
+    def test_enable_cudnn_autotune(self):
+        train_utils.enable_cudnn_autotune(False)
+        self.assertEqual(os.environ['TF_CUDNN_USE_AUTOTUNE'], '0')
+
+        train_utils.enable_cudnn_autotune(True)
+        self.assertEqual(os.environ['TF_CUDNN_USE_AUTOTUNE'], '1')
+        self.assertEqual(os.environ['TF_CUDNN_DETERMINISTIC'], '0')
+
+    def test_enable_xla(self):
+        train_utils.enable_xla(True)
+        self.assertTrue(tf.config.optimizer.get_jit())
+
+        train_utils.enable_xla(False)
+        self.assertFalse(tf.config.optimizer.get_jit())
+
+
 if __name__ == '__main__':
     test.main()